@@ -1,60 +1,31 @@
 """
 Additional API endpoints for YiriAi frontend
 """
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List
-from datetime import datetime, timedelta
-import jwt
-from passlib.context import CryptContext
+from datetime import datetime
 
+from auth_utils import (
+    hash_password, verify_password, create_access_token, verify_token
+)
 from models import (
     UserCreate, UserLogin, Token, User,
     CoursePreferencesInput, ScheduleResult, 
-    SaveScheduleRequest, SearchCoursesRequest
+    SaveScheduleRequest, SearchCoursesRequest, ProfessorRatingsBatchRequest
 )
 
-router = APIRouter(prefix="/api", tags=["api"])
-
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# JWT settings (move to config later)
-SECRET_KEY = "your-secret-key-change-in-production"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+router = APIRouter(
+    prefix="/api",
+    tags=["api"],
+    default_response_class=ORJSONResponse
+)
 
 # Mock user database (replace with real DB)
 fake_users_db = {}
-
-
-def hash_password(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password"""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def create_access_token(data: dict) -> str:
-    """Create JWT access token"""
-    to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-
-
-def verify_token(token: str) -> dict:
-    """Verify JWT token"""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+# Secondary index: lowercased email -> user id
+users_by_email: dict[str, str] = {}
 
 
 async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
@@ -82,13 +53,19 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
 async def register(user: UserCreate):
     """Register a new user"""
     # Check if user already exists
-    for existing_user in fake_users_db.values():
-        if existing_user["email"] == user.email:
-            raise HTTPException(status_code=400, detail="Email already registered")
+    email_key = user.email.lower()
+    if email_key in users_by_email:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # Hash off the event loop (bcrypt is CPU-bound)
+    hashed_password = await run_in_threadpool(hash_password, user.password)
+    
+    # Re-check: another request may have registered this email while hashing
+    if email_key in users_by_email:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create new user
     user_id = str(len(fake_users_db) + 1)
-    hashed_password = hash_password(user.password)
     
     user_data = {
         "id": user_id,
@@ -99,6 +76,7 @@ async def register(user: UserCreate):
     }
     
     fake_users_db[user_id] = user_data
+    users_by_email[email_key] = user_id
     
     # Create access token
     access_token = create_access_token({"sub": user_id})
@@ -118,17 +96,14 @@ async def register(user: UserCreate):
 async def login(credentials: UserLogin):
     """Login user"""
     # Find user by email
-    user = None
-    for uid, u in fake_users_db.items():
-        if u["email"] == credentials.email:
-            user = u
-            break
+    user_id = users_by_email.get(credentials.email.lower())
+    user = fake_users_db.get(user_id) if user_id else None
     
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    # Verify password
-    if not verify_password(credentials.password, user["password"]):
+    # Verify password off the event loop
+    if not await run_in_threadpool(verify_password, credentials.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Create access token
@@ -156,6 +131,103 @@ async def get_me(current_user: dict = Depends(get_current_user)):
     }
 
 
+# Mock payloads, built once at import instead of on every request
+# Parsed evaluation (until real file parsing is wired up)
+_MOCK_PARSED_EVAL = {
+    "success": True,
+    "parsed_eval": {
+        "remaining_credits": 45,
+        "courses": [
+            {"code": "CSC 1301", "title": "Principles of Computer Science I", "credits": 3},
+            {"code": "MATH 2211", "title": "Calculus I", "credits": 4},
+            {"code": "ENGL 1102", "title": "English Composition II", "credits": 3},
+            {"code": "HIST 2110", "title": "Survey of United States History I", "credits": 3},
+        ]
+    }
+}
+
+
+# Generated schedule (until PAWS scraper + course matcher are wired up)
+_MOCK_SCHEDULE = {
+    "fit_score": 92,
+    "total_credits": 15,
+    "courses": [
+        {
+            "crn": "12345",
+            "code": "CSC 1301",
+            "title": "Principles of Computer Science I",
+            "credits": 3,
+            "section": "001",
+            "days": "MWF",
+            "time": "10:00 AM - 10:50 AM",
+            "location": "Classroom South 301",
+            "campus": "Atlanta",
+            "instructor": "Dr. Sarah Johnson",
+            "seats_available": 5,
+            "seats_total": 30,
+            "modality": "In-Person",
+            "professor_rating": {
+                "rating": 4.5,
+                "num_ratings": 42,
+                "difficulty": 3.2
+            },
+            "match_reasons": [
+                "Matches your preferred days (MWF)",
+                "Within your time range (9 AM - 5 PM)",
+                "Highly rated professor"
+            ],
+            "match_score": 92.0
+        },
+        {
+            "crn": "23456",
+            "code": "MATH 2211",
+            "title": "Calculus I",
+            "credits": 4,
+            "section": "002",
+            "days": "TR",
+            "time": "2:00 PM - 3:15 PM",
+            "location": "Langdale Hall 415",
+            "campus": "Atlanta",
+            "instructor": "Prof. Michael Chen",
+            "seats_available": 12,
+            "seats_total": 35,
+            "modality": "In-Person",
+            "professor_rating": {
+                "rating": 4.2,
+                "num_ratings": 38,
+                "difficulty": 3.8
+            },
+            "match_reasons": [
+                "Within your time range",
+                "No schedule conflicts"
+            ],
+            "match_score": 85.0
+        }
+    ]
+}
+
+
+# Saved schedules (until schedules are persisted)
+_MOCK_SAVED_SCHEDULES = {
+    "schedules": [
+        {
+            "id": 1,
+            "name": "Spring 2025 - Preferred",
+            "created_at": "2025-01-15T10:30:00",
+            "fit_score": 92,
+            "total_credits": 15,
+            "course_count": 4,
+            "courses": [
+                {"code": "CSC 1301", "credits": 3, "crn": "12345"},
+                {"code": "MATH 2211", "credits": 4, "crn": "23456"},
+                {"code": "ENGL 1102", "credits": 3, "crn": "34567"},
+                {"code": "HIST 2110", "credits": 3, "crn": "45678"}
+            ]
+        }
+    ]
+}
+
+
 @router.post("/upload-eval")
 async def upload_eval(
     file_data: dict,
@@ -167,18 +239,7 @@ async def upload_eval(
     TODO: Implement actual file parsing
     """
     # Mock parsed data for now
-    return {
-        "success": True,
-        "parsed_eval": {
-            "remaining_credits": 45,
-            "courses": [
-                {"code": "CSC 1301", "title": "Principles of Computer Science I", "credits": 3},
-                {"code": "MATH 2211", "title": "Calculus I", "credits": 4},
-                {"code": "ENGL 1102", "title": "English Composition II", "credits": 3},
-                {"code": "HIST 2110", "title": "Survey of United States History I", "credits": 3},
-            ]
-        }
-    }
+    return _MOCK_PARSED_EVAL
 
 
 @router.post("/generate-schedule", response_model=ScheduleResult)
@@ -191,64 +252,9 @@ async def generate_schedule(
     
     TODO: Connect to real PAWS scraper and course matcher
     """
-    # Mock schedule for now
-    return {
-        "fit_score": 92,
-        "total_credits": 15,
-        "courses": [
-            {
-                "crn": "12345",
-                "code": "CSC 1301",
-                "title": "Principles of Computer Science I",
-                "credits": 3,
-                "section": "001",
-                "days": "MWF",
-                "time": "10:00 AM - 10:50 AM",
-                "location": "Classroom South 301",
-                "campus": "Atlanta",
-                "instructor": "Dr. Sarah Johnson",
-                "seats_available": 5,
-                "seats_total": 30,
-                "modality": "In-Person",
-                "professor_rating": {
-                    "rating": 4.5,
-                    "num_ratings": 42,
-                    "difficulty": 3.2
-                },
-                "match_reasons": [
-                    "Matches your preferred days (MWF)",
-                    "Within your time range (9 AM - 5 PM)",
-                    "Highly rated professor"
-                ],
-                "match_score": 92.0
-            },
-            {
-                "crn": "23456",
-                "code": "MATH 2211",
-                "title": "Calculus I",
-                "credits": 4,
-                "section": "002",
-                "days": "TR",
-                "time": "2:00 PM - 3:15 PM",
-                "location": "Langdale Hall 415",
-                "campus": "Atlanta",
-                "instructor": "Prof. Michael Chen",
-                "seats_available": 12,
-                "seats_total": 35,
-                "modality": "In-Person",
-                "professor_rating": {
-                    "rating": 4.2,
-                    "num_ratings": 38,
-                    "difficulty": 3.8
-                },
-                "match_reasons": [
-                    "Within your time range",
-                    "No schedule conflicts"
-                ],
-                "match_score": 85.0
-            }
-        ]
-    }
+    # Mock schedule for now. Returning the response directly skips
+    # response_model re-validation; the model stays for the OpenAPI schema.
+    return ORJSONResponse(_MOCK_SCHEDULE)
 
 
 @router.post("/schedules/save")
@@ -269,24 +275,7 @@ async def save_schedule(
 async def get_schedules(current_user: dict = Depends(get_current_user)):
     """Get all saved schedules for current user"""
     # TODO: Get from database
-    return {
-        "schedules": [
-            {
-                "id": 1,
-                "name": "Spring 2025 - Preferred",
-                "created_at": "2025-01-15T10:30:00",
-                "fit_score": 92,
-                "total_credits": 15,
-                "course_count": 4,
-                "courses": [
-                    {"code": "CSC 1301", "credits": 3, "crn": "12345"},
-                    {"code": "MATH 2211", "credits": 4, "crn": "23456"},
-                    {"code": "ENGL 1102", "credits": 3, "crn": "34567"},
-                    {"code": "HIST 2110", "credits": 3, "crn": "45678"}
-                ]
-            }
-        ]
-    }
+    return _MOCK_SAVED_SCHEDULES
 
 
 @router.delete("/schedules/{schedule_id}")
@@ -327,3 +316,25 @@ async def get_professor_rating(
         "difficulty": 3.2,
         "would_take_again": 85
     }
+
+
+@router.post("/professor-rating/batch")
+async def get_professor_ratings_batch(
+    request: ProfessorRatingsBatchRequest,
+    http_request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get RateMyProfessors ratings for several professors at once
+    
+    Cached ratings come from a single Redis MGET; the rest are fetched
+    with batched GraphQL requests instead of one request per name.
+    """
+    rmp_scraper = http_request.app.state.rmp_scraper
+    ratings = await rmp_scraper.batch_get_ratings(request.names)
+    
+    return {
+        "ratings": ratings,
+        "found": sum(1 for r in ratings.values() if r),
+        "total": len(ratings)
+    }
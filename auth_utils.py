@@ -0,0 +1,108 @@
+"""
+Authentication helpers shared by the API routes
+Password hashing (bcrypt) and HS256 access tokens
+"""
+from fastapi import HTTPException
+import base64
+import binascii
+import hashlib
+import hmac
+import time
+import bcrypt
+import orjson
+
+# Password hashing (native bcrypt, same $2b$ hash format passlib produced)
+BCRYPT_ROUNDS = 12
+
+# JWT settings (move to config later)
+SECRET_KEY = "your-secret-key-change-in-production"
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
+_ACCESS_TOKEN_TTL_SEC = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+SIGNING_KEY = SECRET_KEY.encode()  # Encoded once instead of per token
+
+
+def hash_password(password: str) -> str:
+    """Hash a password"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password"""
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    except ValueError:
+        # Malformed hash
+        return False
+
+
+def _b64url_encode(data: bytes) -> bytes:
+    """Base64url encode without padding (RFC 7515)"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    """Base64url decode, restoring stripped padding"""
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+# The header never changes, so it is encoded once. Byte-identical to the
+# header PyJWT emitted, so previously issued tokens still verify.
+_JWT_HEADER = _b64url_encode(orjson.dumps({"alg": ALGORITHM, "typ": "JWT"}))
+
+
+def sign_jwt(payload: dict) -> str:
+    """Sign a payload as an HS256 JWT"""
+    signing_input = _JWT_HEADER + b"." + _b64url_encode(orjson.dumps(payload))
+    signature = hmac.new(SIGNING_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url_encode(signature)).decode()
+
+
+def verify_jwt(token: str) -> dict:
+    """
+    Check an HS256 JWT signature and return its payload
+    
+    Raises ValueError if the token is malformed or the signature is invalid.
+    Claims (exp, sub) are not checked here.
+    """
+    parts = token.encode().split(b".")
+    if len(parts) != 3 or parts[0] != _JWT_HEADER:
+        # Only tokens we issued (fixed HS256 header) are accepted
+        raise ValueError("Malformed token")
+    
+    header, body, signature = parts
+    expected = hmac.new(SIGNING_KEY, header + b"." + body, hashlib.sha256).digest()
+    try:
+        valid = hmac.compare_digest(expected, _b64url_decode(signature))
+        payload = orjson.loads(_b64url_decode(body)) if valid else None
+    except (binascii.Error, orjson.JSONDecodeError):
+        raise ValueError("Malformed token")
+    
+    if not valid:
+        raise ValueError("Invalid signature")
+    if not isinstance(payload, dict):
+        raise ValueError("Malformed token")
+    return payload
+
+
+def create_access_token(data: dict) -> str:
+    """Create JWT access token"""
+    to_encode = data.copy()
+    to_encode["exp"] = int(time.time()) + _ACCESS_TOKEN_TTL_SEC
+    return sign_jwt(to_encode)
+
+
+def verify_token(token: str) -> dict:
+    """Verify JWT token"""
+    try:
+        payload = verify_jwt(token)
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    exp = payload.get("exp")
+    if not isinstance(exp, int) or "sub" not in payload:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if exp <= time.time():
+        raise HTTPException(status_code=401, detail="Token expired")
+    
+    return payload
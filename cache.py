@@ -1,22 +1,67 @@
 """
 Redis cache manager
 """
-import json
+import asyncio
+import hashlib
+import diskcache
+import msgpack
+import orjson
 import redis.asyncio as redis
 from typing import Optional, Any
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bump when the payload encoding changes so old entries are never decoded
+# with the wrong format (v1 was JSON, v2 MessagePack, v3 tagged payloads)
+CACHE_KEY_VERSION = "v3"
+
+# One-byte payload tags: raw bytes are stored and returned untouched
+_TAG_PACKED = b"\x00"
+_TAG_RAW = b"\x01"
+
+
+# Server-side SCAN + UNLINK so a pattern clear is a single round-trip.
+# UNLINK frees memory in a background thread instead of blocking like DEL.
+_CLEAR_PATTERN_LUA = """
+local cursor = "0"
+local deleted = 0
+repeat
+    local reply = redis.call("SCAN", cursor, "MATCH", KEYS[1], "COUNT", 1000)
+    cursor = reply[1]
+    local keys = reply[2]
+    if #keys > 0 then
+        deleted = deleted + redis.call("UNLINK", unpack(keys))
+    end
+until cursor == "0"
+return deleted
+"""
+
+
+def _serialize(value: Any, raw: bool = False) -> bytes:
+    """Serialize a value for storage in Redis (MessagePack unless raw)"""
+    if raw:
+        return _TAG_RAW + bytes(value)
+    return _TAG_PACKED + msgpack.packb(value, use_bin_type=True, default=str)
+
+
+def _deserialize(value: bytes) -> Any:
+    """Deserialize a value read from Redis; raw payloads come back as bytes"""
+    if value[:1] == _TAG_RAW:
+        return value[1:]
+    return msgpack.unpackb(value[1:], raw=False, strict_map_key=False)
+
 
 class CacheManager:
     """Manages Redis caching operations"""
     
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
+        self._clear_script = None
         self._initialized = False
     
     async def initialize(self):
@@ -25,16 +70,22 @@ class CacheManager:
             return
         
         try:
-            self.redis_client = await redis.from_url(
+            # Blocking pool: callers wait for a free connection instead of
+            # opening new ones past the limit. The C hiredis parser is picked
+            # up automatically when installed (redis[hiredis]).
+            pool = redis.BlockingConnectionPool.from_url(
                 settings.redis_url,
                 password=settings.redis_password,
-                encoding="utf-8",
-                decode_responses=True,
                 max_connections=settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout,
+                socket_keepalive=True,
+                health_check_interval=settings.redis_health_check_interval,
             )
+            self.redis_client = redis.Redis(connection_pool=pool)
             
             # Test connection
             await self.redis_client.ping()
+            self._clear_script = self.redis_client.register_script(_CLEAR_PATTERN_LUA)
             self._initialized = True
             logger.info("Redis cache initialized successfully")
             
@@ -46,6 +97,7 @@ class CacheManager:
         """Close Redis connection"""
         if self.redis_client:
             await self.redis_client.close()
+            await self.redis_client.connection_pool.disconnect()
             self._initialized = False
     
     async def get(self, key: str) -> Optional[Any]:
@@ -56,7 +108,7 @@ class CacheManager:
         try:
             value = await self.redis_client.get(key)
             if value:
-                return json.loads(value)
+                return _deserialize(value)
             return None
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
@@ -66,23 +118,63 @@ class CacheManager:
         self,
         key: str,
         value: Any,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        raw: bool = False
     ) -> bool:
-        """Set value in cache with optional TTL"""
+        """
+        Set value in cache with optional TTL
+        
+        With raw=True, value must be bytes; it is stored as-is and get()
+        returns it without decoding.
+        """
         if not self.redis_client:
             return False
         
         try:
-            serialized = json.dumps(value, default=str)
-            if ttl:
-                await self.redis_client.setex(key, ttl, serialized)
-            else:
-                await self.redis_client.set(key, serialized)
+            serialized = _serialize(value, raw=raw)
+            await self.redis_client.set(key, serialized, ex=ttl or None)
             return True
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
     
+    async def get_and_refresh(self, key: str, ttl: int) -> Optional[Any]:
+        """
+        Get value and reset its TTL in one round-trip (GETEX, Redis >= 6.2)
+        
+        Use for read-mostly keys that should stay warm while in use.
+        """
+        if not self.redis_client:
+            return None
+        
+        try:
+            value = await self.redis_client.getex(key, ex=ttl)
+            if value:
+                return _deserialize(value)
+            return None
+        except Exception as e:
+            logger.error(f"Cache get_and_refresh error for key {key}: {e}")
+            return None
+    
+    async def get_many_and_refresh(self, keys: list[str], ttl: int) -> dict[str, Any]:
+        """get_many with a GETEX per key, pipelined into one round-trip"""
+        if not self.redis_client or not keys:
+            return {}
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipe.getex(key, ex=ttl)
+            values = await pipe.execute()
+            return {
+                key: _deserialize(value)
+                for key, value in zip(keys, values)
+                if value is not None
+            }
+        except Exception as e:
+            logger.error(f"Cache get_many_and_refresh error: {e}")
+            return {}
+    
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         if not self.redis_client:
@@ -97,16 +189,16 @@ class CacheManager:
     
     async def get_many(self, keys: list[str]) -> dict[str, Any]:
         """Get multiple keys at once"""
-        if not self.redis_client:
+        if not self.redis_client or not keys:
             return {}
         
         try:
             values = await self.redis_client.mget(keys)
-            result = {}
-            for key, value in zip(keys, values):
-                if value:
-                    result[key] = json.loads(value)
-            return result
+            return {
+                key: _deserialize(value)
+                for key, value in zip(keys, values)
+                if value is not None
+            }
         except Exception as e:
             logger.error(f"Cache get_many error: {e}")
             return {}
@@ -114,20 +206,26 @@ class CacheManager:
     async def set_many(
         self,
         items: dict[str, Any],
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        raw: bool = False
     ) -> bool:
-        """Set multiple key-value pairs"""
+        """Set multiple key-value pairs (raw as in set)"""
         if not self.redis_client:
             return False
         
+        if not items:
+            return True
+        
         try:
-            pipe = self.redis_client.pipeline()
-            for key, value in items.items():
-                serialized = json.dumps(value, default=str)
-                if ttl:
-                    pipe.setex(key, ttl, serialized)
-                else:
-                    pipe.set(key, serialized)
+            serialized = {key: _serialize(value, raw=raw) for key, value in items.items()}
+            if not ttl:
+                # Single MSET command instead of N pipelined SETs
+                await self.redis_client.mset(serialized)
+                return True
+            
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in serialized.items():
+                pipe.setex(key, ttl, value)
             await pipe.execute()
             return True
         except Exception as e:
@@ -140,19 +238,7 @@ class CacheManager:
             return 0
         
         try:
-            cursor = 0
-            deleted = 0
-            while True:
-                cursor, keys = await self.redis_client.scan(
-                    cursor=cursor,
-                    match=pattern,
-                    count=100
-                )
-                if keys:
-                    deleted += await self.redis_client.delete(*keys)
-                if cursor == 0:
-                    break
-            return deleted
+            return int(await self._clear_script(keys=[pattern]))
         except Exception as e:
             logger.error(f"Cache clear_pattern error: {e}")
             return 0
@@ -176,21 +262,97 @@ class CacheManager:
             return {"connected": False}
 
 
-# Global cache instance
+class DiskResponseCache:
+    """
+    Disk-backed cache for raw upstream HTTP responses (PAWS HTML, RMP JSON)
+    
+    Sits in front of the scrapers' outbound requests so repeated lookups
+    skip the network entirely, and survives restarts unlike Redis misses
+    on a cold start. Keyed by a hash of method + URL + request body.
+    """
+    
+    def __init__(self):
+        self._cache: Optional[diskcache.Cache] = None
+    
+    @property
+    def enabled(self) -> bool:
+        return settings.http_cache_enabled
+    
+    def _get_cache(self) -> diskcache.Cache:
+        """Open the cache directory on first use"""
+        if self._cache is None:
+            self._cache = diskcache.Cache(settings.http_cache_dir)
+        return self._cache
+    
+    @staticmethod
+    def make_key(method: str, url: str, body: Any = None) -> str:
+        """Stable key for a request; body dicts are hashed with sorted keys"""
+        digest = hashlib.sha256()
+        digest.update(f"{method.upper()} {url}\n".encode())
+        digest.update(orjson.dumps(body, option=orjson.OPT_SORT_KEYS))
+        return digest.hexdigest()
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get a cached response body, or None"""
+        if not self.enabled:
+            return None
+        
+        try:
+            # diskcache is synchronous (SQLite + files); keep it off the loop
+            return await asyncio.to_thread(self._get_cache().get, key)
+        except Exception as e:
+            logger.error(f"Disk cache get error for key {key}: {e}")
+            return None
+    
+    async def set(self, key: str, value: Any, ttl: int) -> bool:
+        """Store a response body for ttl seconds"""
+        if not self.enabled:
+            return False
+        
+        try:
+            return await asyncio.to_thread(self._get_cache().set, key, value, ttl)
+        except Exception as e:
+            logger.error(f"Disk cache set error for key {key}: {e}")
+            return False
+    
+    def close(self):
+        """Close the underlying cache files"""
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+
+# Global cache instances
 cache_manager = CacheManager()
+http_response_cache = DiskResponseCache()
 
 
 # Cache key generators
 def course_cache_key(term: str, subject: str) -> str:
     """Generate cache key for course data"""
-    return f"courses:{term}:{subject}"
+    return f"{CACHE_KEY_VERSION}:courses:{term}:{subject}"
+
 
+# Single-pass slug: spaces -> underscores, drop punctuation
+_PROFESSOR_SLUG = str.maketrans({" ": "_", ",": None, ".": None})
 
+
+@lru_cache(maxsize=4096)
 def professor_cache_key(professor_name: str) -> str:
     """Generate cache key for professor rating"""
-    return f"professor:{professor_name.lower().replace(' ', '_')}"
+    return f"{CACHE_KEY_VERSION}:professor:{professor_name.lower().translate(_PROFESSOR_SLUG)}"
 
 
 def crn_cache_key(term: str, crn: str) -> str:
     """Generate cache key for specific CRN"""
-    return f"crn:{term}:{crn}"
+    return f"{CACHE_KEY_VERSION}:crn:{term}:{crn}"
+
+
+def rmp_cache_key(school: str, professor_name: str) -> str:
+    """Generate cache key for a legacy RMP scraper lookup (school + name)"""
+    return f"{CACHE_KEY_VERSION}:rmp:{school.lower()}:{professor_name.lower()}"
+
+
+def rmp_cache_pattern() -> str:
+    """Pattern matching every rmp_cache_key"""
+    return f"{CACHE_KEY_VERSION}:rmp:*"
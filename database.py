@@ -1,49 +1,64 @@
 """
 Database models and ORM setup
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, JSON, Index
+from sqlalchemy import Integer, String, Float, DateTime, JSON, Index, delete, func, inspect, select, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
 from config import settings
+from utils.batcher import AsyncBatcher
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """Declarative base for typed (SQLAlchemy 2.0) mappings"""
+    pass
 
 
 class CourseCache(Base):
     """Cache for course data from PAWS"""
     __tablename__ = "course_cache"
     
-    id = Column(Integer, primary_key=True, index=True)
-    crn = Column(String(10), nullable=False, index=True)
-    term = Column(String(10), nullable=False, index=True)
-    subject = Column(String(10), nullable=False, index=True)
-    course_number = Column(String(10), nullable=False)
-    section = Column(String(10))
-    title = Column(String(200))
-    credits = Column(Integer)
-    professor = Column(String(100), index=True)
-    days = Column(JSON)  # List of days
-    time_start = Column(String(10))
-    time_end = Column(String(10))
-    location = Column(String(100))
-    seats_available = Column(Integer)
-    total_seats = Column(Integer)
-    waitlist_available = Column(Integer, default=0)
-    delivery_method = Column(String(20))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    crn: Mapped[str] = mapped_column(String(10), index=True)
+    term: Mapped[str] = mapped_column(String(10), index=True)
+    subject: Mapped[str] = mapped_column(String(10), index=True)
+    course_number: Mapped[str] = mapped_column(String(10))
+    section: Mapped[Optional[str]] = mapped_column(String(10))
+    title: Mapped[Optional[str]] = mapped_column(String(200))
+    credits: Mapped[Optional[int]] = mapped_column(Integer)
+    professor: Mapped[Optional[str]] = mapped_column(String(100), index=True)
+    days: Mapped[Optional[Any]] = mapped_column(JSON)  # List of days
+    time_start: Mapped[Optional[str]] = mapped_column(String(10))
+    time_end: Mapped[Optional[str]] = mapped_column(String(10))
+    location: Mapped[Optional[str]] = mapped_column(String(100))
+    seats_available: Mapped[Optional[int]] = mapped_column(Integer)
+    total_seats: Mapped[Optional[int]] = mapped_column(Integer)
+    waitlist_available: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    delivery_method: Mapped[Optional[str]] = mapped_column(String(20))
     
     # Metadata
-    raw_data = Column(JSON)  # Store complete raw data
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=False, index=True)
+    raw_data: Mapped[Optional[Any]] = mapped_column(JSON)  # Store complete raw data
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
     
     # Composite indexes for common queries
     __table_args__ = (
-        Index('idx_term_subject', 'term', 'subject'),
-        Index('idx_term_crn', 'term', 'crn'),
+        # Covers "live courses for term+subject" lookups index-only on
+        # PostgreSQL; also serves plain (term, subject) lookups as a prefix.
+        # Not a partial index: Postgres rejects now() in index predicates.
+        Index(
+            'idx_course_live', 'term', 'subject', 'expires_at',
+            postgresql_include=['crn', 'professor', 'seats_available'],
+        ),
+        # A CRN identifies one section within a term; the scraper upserts on
+        # it. Named apart from the old non-unique idx_term_crn so existing
+        # databases can be upgraded in place (see _ensure_course_unique_index)
+        Index('idx_term_crn_unique', 'term', 'crn', unique=True),
         Index('idx_subject_course', 'subject', 'course_number'),
     )
 
@@ -52,26 +67,28 @@ class ProfessorCache(Base):
     """Cache for professor ratings from RateMyProfessors"""
     __tablename__ = "professor_cache"
     
-    id = Column(Integer, primary_key=True, index=True)
-    professor_name = Column(String(100), nullable=False, index=True)
-    school_id = Column(String(50), nullable=False)
-    rmp_id = Column(String(50))
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    professor_name: Mapped[str] = mapped_column(String(100), index=True)
+    school_id: Mapped[str] = mapped_column(String(50))
+    rmp_id: Mapped[Optional[str]] = mapped_column(String(50))
     
     # Rating data
-    avg_rating = Column(Float)
-    avg_difficulty = Column(Float)
-    would_take_again_percent = Column(Float)
-    num_ratings = Column(Integer)
-    department = Column(String(100))
+    avg_rating: Mapped[Optional[float]] = mapped_column(Float)
+    avg_difficulty: Mapped[Optional[float]] = mapped_column(Float)
+    would_take_again_percent: Mapped[Optional[float]] = mapped_column(Float)
+    num_ratings: Mapped[Optional[int]] = mapped_column(Integer)
+    department: Mapped[Optional[str]] = mapped_column(String(100))
     
     # Additional data
-    tags = Column(JSON)  # Common tags from RMP
-    raw_data = Column(JSON)  # Store complete response
+    tags: Mapped[Optional[Any]] = mapped_column(JSON)  # Common tags from RMP
+    raw_data: Mapped[Optional[Any]] = mapped_column(JSON)  # Store complete response
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True)
     
     # Ensure unique professor per school
     __table_args__ = (
@@ -79,27 +96,33 @@ class ProfessorCache(Base):
     )
 
 
+# Case-insensitive professor lookups (WHERE lower(professor_name) = ...)
+Index('idx_prof_name_lower', func.lower(ProfessorCache.professor_name))
+
+
 class ScraperLog(Base):
     """Log scraping operations for monitoring and debugging"""
     __tablename__ = "scraper_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
-    source = Column(String(50), nullable=False, index=True)  # 'paws' or 'rmp'
-    operation = Column(String(100), nullable=False)
-    status = Column(String(20), nullable=False, index=True)  # 'success', 'error', 'timeout'
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    source: Mapped[str] = mapped_column(String(50), index=True)  # 'paws' or 'rmp'
+    operation: Mapped[str] = mapped_column(String(100))
+    status: Mapped[str] = mapped_column(String(20), index=True)  # 'success', 'error', 'timeout'
     
     # Request details
-    term = Column(String(10))
-    subject = Column(String(10))
-    query_params = Column(JSON)
+    term: Mapped[Optional[str]] = mapped_column(String(10))
+    subject: Mapped[Optional[str]] = mapped_column(String(10))
+    query_params: Mapped[Optional[Any]] = mapped_column(JSON)
     
     # Response details
-    items_found = Column(Integer, default=0)
-    duration_ms = Column(Integer)
-    error_message = Column(String(500))
+    items_found: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer)
+    error_message: Mapped[Optional[str]] = mapped_column(String(500))
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True
+    )
 
 
 # Database engine and session
@@ -109,6 +132,7 @@ engine = create_async_engine(
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
     pool_pre_ping=True,  # Verify connections before using
+    query_cache_size=1200,  # Reuse compiled statements across requests
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -118,6 +142,22 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+class ScraperLogBatcher(AsyncBatcher):
+    """Writes queued ScraperLog rows in one transaction per batch"""
+    
+    async def process_batch(self, batch: List[ScraperLog]):
+        async with AsyncSessionLocal() as session:
+            session.add_all(batch)
+            await session.commit()
+
+
+# Shared by the scrapers; flushed on application shutdown
+scraper_log_batcher = ScraperLogBatcher(
+    max_batch_size=settings.scraper_log_batch_size,
+    max_queue_time=settings.scraper_log_flush_interval,
+)
+
+
 async def get_db():
     """Dependency for getting database sessions"""
     async with AsyncSessionLocal() as session:
@@ -131,7 +171,29 @@ async def get_db():
             await session.close()
 
 
+def _ensure_course_unique_index(conn):
+    """
+    Add the (term, crn) unique index to a course_cache table created before
+    it existed: create_all never alters existing tables, and older versions
+    inserted a new row per scrape, so duplicates are dropped (newest kept)
+    """
+    indexes = inspect(conn).get_indexes(CourseCache.__tablename__)
+    if any(index["name"] == "idx_term_crn_unique" for index in indexes):
+        return
+    
+    conn.execute(delete(CourseCache).where(CourseCache.id.not_in(
+        select(func.max(CourseCache.id)).group_by(CourseCache.term, CourseCache.crn)
+    )))
+    if any(index["name"] == "idx_term_crn" for index in indexes):
+        conn.execute(text("DROP INDEX idx_term_crn"))  # superseded by the unique one
+    next(
+        index for index in CourseCache.__table__.indexes
+        if index.name == "idx_term_crn_unique"
+    ).create(conn)
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_ensure_course_unique_index)
@@ -2,14 +2,23 @@
 YiriAi - GSU Course Selection Assistant (Production Version)
 FastAPI application with real data integration, caching, and monitoring
 """
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional
+import asyncio
 import logging
+import multiprocessing
+import os
+import uuid
+import httpx
+import orjson
 import structlog
-from datetime import datetime
+from datetime import datetime, timezone
 
 from models import CoursePreferences, MatchedCourse, RegistrationResponse
 from scrapers.paws_scraper import PAWSScraper
@@ -17,19 +26,23 @@ from scrapers.rmp_scraper import RateMyProfessorsScraper
 from utils.course_matcher import CourseMatcher
 from utils.file_parser import FileParser
 from config import settings
-from cache import cache_manager
-from database import init_db, get_db
+from cache import cache_manager, http_response_cache
+from database import init_db, get_db, scraper_log_batcher
 from api_routes import router as api_router
 
 # Configure structured logging
+# orjson renders events straight to bytes, so pair it with a bytes logger
 structlog.configure(
     processors=[
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.JSONRenderer()
-    ]
+        structlog.processors.JSONRenderer(serializer=orjson.dumps)
+    ],
+    logger_factory=structlog.BytesLoggerFactory()
 )
 logger = structlog.get_logger()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -46,12 +59,35 @@ async def lifespan(app: FastAPI):
         await cache_manager.initialize()
         logger.info("cache_initialized")
         
+        # One HTTP/2 client shared by both scrapers so requests reuse
+        # pooled connections instead of paying a TLS handshake each
+        app.state.http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=settings.scraper_timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=settings.scraper_concurrent_requests * 2,
+                max_keepalive_connections=settings.scraper_concurrent_requests * 2
+            )
+        )
+        
         # Initialize scrapers
-        app.state.paws_scraper = PAWSScraper()
-        app.state.rmp_scraper = RateMyProfessorsScraper()
+        app.state.paws_scraper = PAWSScraper(session=app.state.http_client)
+        app.state.rmp_scraper = RateMyProfessorsScraper(session=app.state.http_client)
         app.state.course_matcher = CourseMatcher()
         app.state.file_parser = FileParser()
         
+        # CPU-bound matching runs in worker processes off the event loop.
+        # Workers start lazily, after this process already has threads, so
+        # they must not be forked from it; the default size splits the CPUs
+        # between uvicorn workers instead of giving each one all of them
+        cpus = os.cpu_count() or 1
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        app.state.matcher_pool = ProcessPoolExecutor(
+            max_workers=settings.matcher_workers or max(1, cpus // (settings.workers or cpus)),
+            mp_context=multiprocessing.get_context(start_method)
+        )
+        
         logger.info("application_ready")
         
     except Exception as e:
@@ -69,9 +105,17 @@ async def lifespan(app: FastAPI):
             await app.state.paws_scraper.close()
         if hasattr(app.state, 'rmp_scraper'):
             await app.state.rmp_scraper.close()
+        if hasattr(app.state, 'http_client'):
+            await app.state.http_client.aclose()
+        if hasattr(app.state, 'matcher_pool'):
+            app.state.matcher_pool.shutdown(wait=False, cancel_futures=True)
         
-        # Close cache
+        # Flush batched scraper logs
+        await scraper_log_batcher.close()
+        
+        # Close caches
         await cache_manager.close()
+        http_response_cache.close()
         
         logger.info("shutdown_complete")
         
@@ -84,6 +128,7 @@ app = FastAPI(
     description="Production-ready course selection automation for GSU students",
     version=settings.app_version,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
 )
@@ -97,6 +142,9 @@ app.add_middleware(
     allow_headers=settings.cors_headers_list,
 )
 
+# Compress large JSON payloads (course lists, matched schedules)
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+
 # Include API routes
 app.include_router(api_router)
 
@@ -165,7 +213,10 @@ async def upload_preferences(
     Returns:
         RegistrationResponse with matched courses and CRNs
     """
-    request_id = datetime.now().isoformat()
+    # Unique per request even under concurrency (the old isoformat id could
+    # collide); the response timestamp is taken once and reused
+    request_id = uuid.uuid4().hex
+    timestamp = datetime.now(timezone.utc).isoformat()
     logger.info(
         "processing_preferences",
         request_id=request_id,
@@ -181,16 +232,23 @@ async def upload_preferences(
         course_matcher: CourseMatcher = app.state.course_matcher
         file_parser: FileParser = app.state.file_parser
         
-        # Parse evaluation file if provided
-        eval_data = None
-        if eval_file:
-            eval_content = await eval_file.read()
-            eval_data = file_parser.parse_evaluation(eval_content, eval_file.filename)
-            logger.info("parsed_evaluation", courses_count=len(eval_data))
+        # Parse both files concurrently. Parsers read the spooled uploads
+        # directly (no full in-memory copy) in worker threads.
+        async def parse_eval():
+            if not eval_file:
+                return None
+            return await run_in_threadpool(
+                file_parser.parse_evaluation, eval_file.file, eval_file.filename
+            )
         
-        # Parse preferences file
-        prefs_content = await prefs_file.read()
-        preferences = file_parser.parse_preferences(prefs_content, prefs_file.filename)
+        eval_data, preferences = await asyncio.gather(
+            parse_eval(),
+            run_in_threadpool(
+                file_parser.parse_preferences, prefs_file.file, prefs_file.filename
+            )
+        )
+        if eval_data is not None:
+            logger.info("parsed_evaluation", courses_count=len(eval_data))
         logger.info("parsed_preferences", courses_count=len(preferences.courses))
         
         if not preferences.subjects:
@@ -210,22 +268,33 @@ async def upload_preferences(
         logger.info("scraped_courses", count=len(available_courses))
         
         if not available_courses:
-            return RegistrationResponse(
+            response = RegistrationResponse(
                 matched_courses=[],
                 paws_link=paws_scraper.generate_registration_link(term),
                 term=term,
-                timestamp=datetime.now().isoformat(),
-                instructions="No available courses found for the specified criteria. Try different subjects or term.",
-                total_credits=0
+                timestamp=timestamp,
+                instructions="No available courses found for the specified criteria. Try different subjects or term."
             )
+            return ORJSONResponse(response.model_dump(mode="json"))
         
         # Match courses based on preferences
         logger.info("matching_courses")
-        matched_courses = course_matcher.match_courses(
-            preferences=preferences,
-            available_courses=available_courses,
-            completed_courses=eval_data
-        )
+        if len(available_courses) >= settings.matcher_offload_min_courses:
+            # Large catalogs: match in a worker process (inputs are pickled,
+            # so small lists are cheaper to match inline)
+            matched_courses = await asyncio.get_running_loop().run_in_executor(
+                app.state.matcher_pool,
+                course_matcher.match_courses,
+                preferences,
+                available_courses,
+                eval_data
+            )
+        else:
+            matched_courses = course_matcher.match_courses(
+                preferences=preferences,
+                available_courses=available_courses,
+                completed_courses=eval_data
+            )
         logger.info("matched_courses", count=len(matched_courses))
         
         # Enhance with RateMyProfessors data if requested
@@ -260,7 +329,7 @@ async def upload_preferences(
             matched_courses=matched_courses[:20],  # Limit to top 20
             paws_link=paws_link,
             term=term,
-            timestamp=datetime.now().isoformat(),
+            timestamp=timestamp,
             instructions=(
                 "🎓 YiriAi Course Selection Complete!\n\n"
                 "Steps to register:\n"
@@ -280,7 +349,10 @@ async def upload_preferences(
             total_credits=response.total_credits
         )
         
-        return response
+        # Dump once and hand orjson plain data. Returning a Response also
+        # skips FastAPI's jsonable_encoder pass and response_model
+        # re-validation; response_model stays for the OpenAPI schema.
+        return ORJSONResponse(response.model_dump(mode="json"))
         
     except HTTPException:
         raise
@@ -294,6 +366,7 @@ async def upload_preferences(
 
 @app.get("/api/search-courses")
 async def search_courses(
+    request: Request,
     term: str,
     subject: Optional[str] = None,
     course_number: Optional[str] = None,
@@ -303,6 +376,9 @@ async def search_courses(
     """
     Search for courses in GSU PAWS
     
+    Clients sending ``Accept: application/x-ndjson`` get one course per
+    line, streamed as it is produced, instead of a single JSON document.
+    
     Args:
         term: GSU term code
         subject: Subject code (e.g., CSC)
@@ -315,11 +391,25 @@ async def search_courses(
         
         logger.info("searching_courses", term=term, subject=subject)
         
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            rows = paws_scraper.iter_search_courses(
+                term=term,
+                subject=subject,
+                course_number=course_number,
+                keyword=keyword,
+                use_cache=use_cache
+            )
+            return StreamingResponse(
+                (orjson.dumps(row) + b"\n" async for row in rows),
+                media_type=NDJSON_MEDIA_TYPE
+            )
+        
         courses = await paws_scraper.search_courses(
             term=term,
             subject=subject,
             course_number=course_number,
-            keyword=keyword
+            keyword=keyword,
+            use_cache=use_cache
         )
         
         return {
@@ -381,7 +471,7 @@ async def clear_cache(pattern: Optional[str] = None):
     Clear cache (admin endpoint)
     
     Args:
-        pattern: Optional pattern to match keys (e.g., "courses:*")
+        pattern: Optional pattern to match keys (e.g., "v3:courses:*")
     """
     try:
         if pattern:
@@ -431,9 +521,14 @@ async def get_stats():
 
 if __name__ == "__main__":
     import uvicorn
+    workers = settings.workers or os.cpu_count() or 1
     uvicorn.run(
-        app,
+        # Multiple workers need an import string so each process loads the app
+        "main:app" if workers > 1 else app,
         host=settings.host,
         port=settings.port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         log_level="info" if settings.debug else "warning"
     )
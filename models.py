@@ -1,9 +1,10 @@
 """
 Data models for YiriAi application
 """
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_serializer, field_validator
+from typing import List, Optional, Dict, Any, Iterable
 from datetime import time, datetime
+from enum import IntFlag
 
 
 # Authentication Models
@@ -35,8 +36,39 @@ class User(BaseModel):
     created_at: datetime
 
 
+class Weekday(IntFlag):
+    """Meeting days as bit flags, named by Banner day code"""
+    M = 1
+    T = 2
+    W = 4
+    R = 8   # Thursday
+    F = 16
+    S = 32  # Saturday
+    U = 64  # Sunday
+    
+    @classmethod
+    def from_codes(cls, codes: Iterable[str]) -> "Weekday":
+        """Fold day codes ("MWF" or ["M", "W", "F"]) into flags; unknown codes are ignored"""
+        days = cls(0)
+        for code in codes:
+            day = _WEEKDAY_BY_CODE.get(code)
+            if day is not None:
+                days |= day
+        return days
+    
+    def codes(self) -> List[str]:
+        """Day codes in week order, e.g. ["M", "W", "F"]"""
+        return [day.name for day in _WEEKDAYS if self & day]
+
+
+_WEEKDAYS = tuple(Weekday.__members__.values())
+_WEEKDAY_BY_CODE = {day.name: day for day in _WEEKDAYS}
+
+
 class TimeSlot(BaseModel):
     """Time slot for a course"""
+    model_config = ConfigDict(frozen=True)
+    
     days: List[str]  # e.g., ["M", "W", "F"]
     start_time: str  # e.g., "09:00"
     end_time: str    # e.g., "10:15"
@@ -44,6 +76,8 @@ class TimeSlot(BaseModel):
 
 class CoursePreference(BaseModel):
     """Individual course preference"""
+    model_config = ConfigDict(frozen=True)
+    
     subject: str  # e.g., "CSC"
     course_number: Optional[str] = None  # e.g., "1301"
     priority: int = 1  # 1 = highest priority
@@ -71,7 +105,7 @@ class MatchedCourse(BaseModel):
     title: str
     credits: int
     professor: Optional[str] = None
-    days: List[str] = []
+    days: Weekday = Weekday(0)  # Serialized as ["M", "W", "F"]
     time: Optional[str] = None
     location: Optional[str] = None
     seats_available: int = 0
@@ -86,6 +120,23 @@ class MatchedCourse(BaseModel):
     # Matching metadata
     match_score: float = 0.0
     priority: int = 1
+    
+    @field_validator('days', mode='before')
+    @classmethod
+    def days_from_codes(cls, value):
+        """Accept the day-code list form used in JSON, cache and DB rows"""
+        if isinstance(value, str) and value.strip().upper() in ("", "TBA"):
+            # Banner's placeholder for unscheduled sections; "T" is not Tuesday
+            return Weekday(0)
+        if isinstance(value, (list, tuple, str)):
+            return Weekday.from_codes(value)
+        if isinstance(value, int):
+            return Weekday(value)
+        return value
+    
+    @field_serializer('days')
+    def days_to_codes(self, days: Weekday) -> List[str]:
+        return days.codes()
 
 
 class RegistrationResponse(BaseModel):
@@ -95,17 +146,24 @@ class RegistrationResponse(BaseModel):
     term: str
     timestamp: str
     instructions: str
-    total_credits: int = 0
     
-    def __init__(self, **data):
-        super().__init__(**data)
-        # Calculate total credits
-        self.total_credits = sum(course.credits for course in self.matched_courses)
+    @computed_field
+    @property
+    def total_credits(self) -> int:
+        """Total credits across matched courses (computed on serialization)"""
+        return sum(course.credits for course in self.matched_courses)
 
 
 class CompletedCourse(BaseModel):
     """Course from student evaluation/transcript"""
+    model_config = ConfigDict(frozen=True)
+    
     subject: str
     course_number: str
     grade: str
     term: str
+
+
+class ProfessorRatingsBatchRequest(BaseModel):
+    """Batch professor rating lookup"""
+    names: List[str] = Field(..., min_length=1, max_length=100)
@@ -3,26 +3,237 @@ GSU PAWS Schedule Scraper - Production Version
 Real implementation with Banner system parsing, caching, and retry logic
 """
 import httpx
-from bs4 import BeautifulSoup
-from typing import List, Optional, Dict, Tuple
+from lxml import etree
+from typing import AsyncIterator, Iterator, List, Optional, Dict, Tuple
 import logging
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import re
+from operator import itemgetter
+from functools import lru_cache
+import orjson
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from models import MatchedCourse
+from models import MatchedCourse, Weekday
 from config import settings
-from cache import cache_manager, course_cache_key, crn_cache_key
-from database import AsyncSessionLocal, CourseCache, ScraperLog
+from cache import cache_manager, http_response_cache, course_cache_key, crn_cache_key
+from database import AsyncSessionLocal, CourseCache, ScraperLog, scraper_log_batcher
+from utils.rate_limiter import AsyncRateLimiter
 
 logger = logging.getLogger(__name__)
 
 
+# Compiled once; these run for every course parsed
+_TITLE_RE = re.compile(r'\b(Dr\.|Prof\.|Mr\.|Ms\.|Mrs\.)\s*', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'\s*\([^)]*@[^)]*\)')
+_INITIAL_RE = re.compile(r'\s*\([A-Z]\)')
+# Anchored on the numeric CRN so titles containing " - " still parse
+_CAPTION_RE = re.compile(
+    r'^(?P<title>.+?)\s+-\s+(?P<crn>\d+)\s+-\s+(?P<subj>\S+)\s+(?P<num>\S+)\s+-\s+(?P<sec>\S+)\s*$'
+)
+_ONLINE_RE = re.compile(r'ONLINE|WEB|INTERNET|VIRTUAL', re.IGNORECASE)
+_SEATS_XY_RE = re.compile(r'(\d+)\s*(?:/|of)\s*(\d+)')
+# Seat and credit phrasings, fused into one alternation scanned once per
+# course. Each alternative has a single named group; within each kind,
+# earlier names take priority regardless of where in the text they match
+_SEATS_GROUPS = ("seats_avail", "available", "remain")
+_CREDIT_GROUPS = ("credits", "credits_label", "hours")
+_META_RE = re.compile("|".join((
+    r'Seats\s+Avail[^:]*:\s*(?P<seats_avail>\d+)',
+    r'Available:\s*(?P<available>\d+)',
+    r'(?P<remain>\d+)\s+(?:seats?\s+)?remain',
+    r'(?P<credits>\d+(?:\.\d+)?)\s+Credits?',
+    r'Credits?:\s*(?P<credits_label>\d+(?:\.\d+)?)',
+    r'(?P<hours>\d+(?:\.\d+)?)\s+(?:Credit\s+)?Hours?',
+)), re.IGNORECASE)
+
+
+# Static parts of the Banner forms; only the term and subject vary per request
+_TERM_FORM = {"p_calling_proc": "bwckschd.p_disp_dyn_sched"}
+_SEARCH_FORM = {
+    "sel_day": "dummy",
+    "sel_schd": "dummy",
+    "sel_insm": "dummy",
+    "sel_camp": "%",
+    "sel_levl": "dummy",
+    "sel_sess": "dummy",
+    "sel_instr": "%",
+    "sel_ptrm": "%",
+    "sel_attr": "dummy",
+    "sel_crse": "",
+    "sel_title": "",
+    "sel_from_cred": "",
+    "sel_to_cred": "",
+    "begin_hh": "0",
+    "begin_mi": "0",
+    "begin_ap": "a",
+    "end_hh": "0",
+    "end_mi": "0",
+    "end_ap": "a",
+}
+
+
+def _has_class(cls: str) -> str:
+    """XPath predicate matching an element whose class list contains cls"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+def _text(element, strip: bool = False) -> str:
+    """Element text; strip=True trims each text node, like bs4's get_text(strip=True)"""
+    if strip:
+        return "".join(t.strip() for t in element.itertext())
+    return "".join(element.itertext())
+
+
+# XPath expressions compiled once and reused for every page and course
+_XP_IS_COURSE_TABLE = etree.XPath(_has_class('datadisplaytable'))
+_XP_CAPTION = etree.XPath(f".//caption[{_has_class('captiontext')}]")
+_XP_ROWS = etree.XPath(".//tr")
+_XP_CELLS = etree.XPath(".//td")
+_XP_HEADER_CELLS = etree.XPath("./th")
+_XP_ENROLL_LINK = etree.XPath(".//a[contains(@href, 'bwckschd.p_disp_detail_sched')]")
+
+
+# Detail-table columns we read, with Banner's usual positions as fallback:
+# Type, Time, Days, Where, Date Range, Schedule Type, Instructors
+_DETAIL_COLUMNS = (("Time", 1), ("Days", 2), ("Where", 3), ("Instructors", 6))
+
+
+@lru_cache(maxsize=16)
+def _detail_column_picker(headers: Tuple[str, ...]) -> Tuple[itemgetter, int]:
+    """
+    Getter returning the (time, days, where, instructors) cells of a detail
+    row, plus the minimum cell count a row needs; cached per header layout
+    """
+    col_idx = {name: i for i, name in enumerate(headers)}
+    indices = [col_idx.get(name, default) for name, default in _DETAIL_COLUMNS]
+    return itemgetter(*indices), max(indices) + 1
+
+
+def _release(element):
+    """Free a parsed element and everything before it under the same parent"""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+class _CourseTableStream:
+    """
+    Incremental Banner page parser yielding (header, detail) course table
+    pairs as soon as both tables are complete
+    
+    Each captioned "datadisplaytable" is paired with the course table that
+    follows it; uncaptioned tables between pairs are skipped. Tables are
+    freed once the consumer has handled them, so memory stays bounded by
+    a pair of tables rather than the whole page.
+    """
+    
+    def __init__(self, encoding: Optional[str] = None):
+        self._parser = etree.HTMLPullParser(events=("end",), tag="table", encoding=encoding)
+        self._header = None
+    
+    def feed(self, data) -> Iterator[Tuple]:
+        """Parse another chunk of the page (bytes, or str if no encoding was given)"""
+        self._parser.feed(data)
+        return self._pairs()
+    
+    def close(self) -> Iterator[Tuple]:
+        """Finish the page"""
+        self._parser.close()
+        return self._pairs()
+    
+    def _pairs(self) -> Iterator[Tuple]:
+        for _, table in self._parser.read_events():
+            if not _XP_IS_COURSE_TABLE(table):
+                continue
+            if self._header is None:
+                if _XP_CAPTION(table):
+                    self._header = table
+                continue
+            
+            header, self._header = self._header, None
+            yield header, table
+            header.clear()
+            _release(table)
+
+
+def _course_from_cache(data: Dict) -> MatchedCourse:
+    """
+    Rebuild a cached course without re-validating it: the dict came from
+    MatchedCourse.model_dump(), so only days needs converting back from codes
+    """
+    return MatchedCourse.model_construct(**{**data, "days": Weekday.from_codes(data.get("days") or ())})
+
+
+@lru_cache(maxsize=64)
+def _parse_days_cached(days_str: str) -> Weekday:
+    """Banner day codes (M, T, W, R, F, S, U) to flags; only a few dozen distinct strings occur"""
+    return Weekday.from_codes(days_str)
+
+
+def _course_upsert(dialect: str, rows: List[Dict]):
+    """Single multi-row INSERT for CourseCache, refreshing rows already cached for (term, crn)"""
+    if dialect == "postgresql":
+        stmt = pg_insert(CourseCache).values(rows)
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(CourseCache).values(rows)
+    else:
+        return insert(CourseCache).values(rows)
+    
+    refreshed = {
+        key: stmt.excluded[key]
+        for key in rows[0]
+        if key not in ("crn", "term", "created_at")
+    }
+    return stmt.on_conflict_do_update(index_elements=["term", "crn"], set_=refreshed)
+
+
+async def _copy_courses(session, term: str, rows: List[Dict]):
+    """
+    Replace the term's cached rows for these CRNs and bulk load the new ones
+    with COPY (asyncpg only), inside the session's transaction
+    """
+    await session.execute(
+        delete(CourseCache).where(
+            CourseCache.term == term,
+            CourseCache.crn.in_([row["crn"] for row in rows]),
+        )
+    )
+    
+    columns = list(rows[0])
+    json_columns = {i for i, key in enumerate(columns) if key in ("days", "raw_data")}
+    records = [
+        tuple(
+            orjson.dumps(value).decode() if i in json_columns else value
+            for i, value in enumerate(row.values())
+        )
+        for row in rows
+    ]
+    
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        CourseCache.__tablename__, records=records, columns=columns
+    )
+
+
+@lru_cache(maxsize=32)
+def _registration_link(base_url: str, term: str) -> str:
+    """PAWS registration link; pure in (base_url, term) so memoized"""
+    return f"{base_url}/bprod/twbkwbis.P_GenMenu?name=bmenu.P_RegMnu&term={term}"
+
+
 class PAWSScraper:
     """Production-ready scraper for GSU PAWS/Banner course schedule"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[httpx.AsyncClient] = None):
         self.base_url = settings.gsu_paws_base_url
         self.schedule_url = settings.gsu_paws_schedule_url
         self.headers = {
@@ -31,22 +242,55 @@ class PAWSScraper:
             "Accept-Language": "en-US,en;q=0.5",
             "Connection": "keep-alive",
         }
-        self._session: Optional[httpx.AsyncClient] = None
+        # A shared client may be injected (see main.lifespan); it is owned
+        # by the caller and never closed here
+        self._session: Optional[httpx.AsyncClient] = session
+        self._owns_session = session is None
+        # Terms whose Banner context is already set in the client's cookie jar
+        self._term_initialized: set[str] = set()
+        self._term_lock = asyncio.Lock()
+        # Fire-and-forget writes; referenced here so they are not GC'd mid-flight
+        self._bg_tasks: set[asyncio.Task] = set()
+        # Scrapes in progress, keyed (term, subject, open_only, use_cache);
+        # concurrent callers for the same page share one
+        self._inflight: Dict[Tuple[str, str, bool, bool], asyncio.Future] = {}
+        # Paces Banner requests; the semaphore in get_available_courses only
+        # bounds how many run at once
+        self._rate_limiter = AsyncRateLimiter(settings.scraper_requests_per_second)
     
     async def _get_session(self) -> httpx.AsyncClient:
         """Get or create HTTP session"""
+        if not self._owns_session:
+            return self._session
+        
         if self._session is None or self._session.is_closed:
+            self._term_initialized.clear()  # new cookie jar
+            # HTTP/2 multiplexes the concurrent subject POSTs over one
+            # connection; httpx falls back to HTTP/1.1 if ALPN declines h2
             self._session = httpx.AsyncClient(
+                http2=True,
                 timeout=settings.scraper_timeout,
                 headers=self.headers,
                 follow_redirects=True,
-                limits=httpx.Limits(max_connections=settings.scraper_concurrent_requests)
+                limits=httpx.Limits(
+                    max_connections=settings.scraper_concurrent_requests,
+                    max_keepalive_connections=settings.scraper_concurrent_requests
+                )
             )
         return self._session
     
+    def _spawn(self, coro):
+        """Run a coroutine in the background, tracked until it finishes"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+    
     async def close(self):
-        """Close HTTP session"""
-        if self._session and not self._session.is_closed:
+        """Finish pending background writes, then close HTTP session"""
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+        
+        if self._owns_session and self._session and not self._session.is_closed:
             await self._session.aclose()
     
     @retry(
@@ -73,153 +317,286 @@ class PAWSScraper:
         Returns:
             List of MatchedCourse objects
         """
-        start_time = datetime.now()
-        all_courses = []
+        start_ns = time.perf_counter_ns()
+        by_subject: Dict[str, List[MatchedCourse]] = {}
+        
+        # Check cache first: one MGET for every subject. Course lists are
+        # stored as raw orjson bytes, so the cache layer hands them back
+        # undecoded and they are parsed once here
+        if use_cache and subjects:
+            cache_keys = {subject: course_cache_key(term, subject) for subject in subjects}
+            cached = await cache_manager.get_many(list(cache_keys.values()))
+            
+            for subject, cache_key in cache_keys.items():
+                cached_data = cached.get(cache_key)
+                if cached_data is not None:  # b"[]" is a cached empty subject
+                    logger.info(f"Cache hit for {subject} in term {term}")
+                    by_subject[subject] = [_course_from_cache(c) for c in orjson.loads(cached_data)]
+        
+        # Scrape the misses. Subjects are independent requests; fan them out.
+        # PAWS sees at most scraper_concurrent_requests at once, started no
+        # faster than scraper_requests_per_second (see _rate_limiter)
+        to_scrape = [subject for subject in dict.fromkeys(subjects) if subject not in by_subject]
+        semaphore = asyncio.Semaphore(settings.scraper_concurrent_requests)
+        # Without a cache write to feed, closed sections need not be built at all
+        skip_closed = open_only and not use_cache
         
+        async def fetch(subject: str) -> Optional[List[MatchedCourse]]:
+            async with semaphore:
+                return await self._scrape_subject_courses(term, subject, skip_closed, use_cache)
+        
+        results = await asyncio.gather(
+            *(fetch(subject) for subject in to_scrape),
+            return_exceptions=True
+        )
+        
+        fresh = {}
+        empty = {}
+        fresh_courses = []
+        for subject, result in zip(to_scrape, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error scraping {subject}: {result}")
+                result = None
+            by_subject[subject] = result or []
+            if result:
+                fresh[course_cache_key(term, subject)] = orjson.dumps([c.model_dump() for c in result])
+                fresh_courses.extend(result)
+            elif result is not None:
+                # Empty subject: remember briefly so it is not re-scraped on
+                # every request. Failures (None) are never cached.
+                empty[course_cache_key(term, subject)] = b"[]"
+        
+        # Cache the results (pipelined writes). The database copy is only a
+        # persistent cache, so it is written in the background off the
+        # request path, and only when something was actually scraped
+        if use_cache:
+            await cache_manager.set_many(fresh, ttl=settings.cache_ttl_courses, raw=True)
+            await cache_manager.set_many(empty, ttl=settings.cache_ttl_empty, raw=True)
+            if fresh_courses:
+                self._spawn(self._store_courses_in_db(fresh_courses, term))
+        
+        all_courses = []
         for subject in subjects:
-            try:
-                # Check cache first
-                if use_cache:
-                    cache_key = course_cache_key(term, subject)
-                    cached_data = await cache_manager.get(cache_key)
-                    
-                    if cached_data:
-                        logger.info(f"Cache hit for {subject} in term {term}")
-                        courses = [MatchedCourse(**c) for c in cached_data]
-                        if open_only:
-                            courses = [c for c in courses if c.seats_available > 0]
-                        all_courses.extend(courses)
-                        continue
-                
-                # Scrape fresh data
-                logger.info(f"Scraping courses for {subject} in term {term}")
-                courses = await self._scrape_subject(term, subject)
-                
-                # Cache the results
-                if use_cache and courses:
-                    cache_key = course_cache_key(term, subject)
-                    cache_data = [c.dict() for c in courses]
-                    await cache_manager.set(cache_key, cache_data, ttl=settings.cache_ttl_courses)
-                    
-                    # Also store in database
-                    await self._store_courses_in_db(courses, term)
-                
-                if open_only:
-                    courses = [c for c in courses if c.seats_available > 0]
-                
-                all_courses.extend(courses)
-                logger.info(f"Found {len(courses)} courses for {subject}")
-                
-                # Rate limiting between subjects
-                await asyncio.sleep(settings.scraper_retry_delay)
-                
-            except Exception as e:
-                logger.error(f"Error scraping {subject}: {str(e)}", exc_info=True)
-                await self._log_scraper_error(term, subject, str(e))
-                continue
+            courses = by_subject[subject]
+            if open_only:
+                courses = [c for c in courses if c.seats_available > 0]
+            all_courses.extend(courses)
         
-        duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
         await self._log_scraper_success(term, subjects, len(all_courses), duration_ms)
         
         return all_courses
     
-    async def _scrape_subject(
+    async def _scrape_subject_courses(
         self,
         term: str,
-        subject: str
+        subject: str,
+        open_only: bool = False,
+        use_cache: bool = True
+    ) -> Optional[List[MatchedCourse]]:
+        """Scrape one subject; errors are logged and yield None"""
+        try:
+            logger.info(f"Scraping courses for {subject} in term {term}")
+            courses = await self._scrape_subject_once(term, subject, open_only, use_cache)
+            logger.info(f"Found {len(courses)} courses for {subject}")
+            return courses
+            
+        except Exception as e:
+            logger.error(f"Error scraping {subject}: {str(e)}", exc_info=True)
+            await self._log_scraper_error(term, subject, str(e))
+            return None
+    
+    async def _scrape_subject_once(
+        self,
+        term: str,
+        subject: str,
+        open_only: bool = False,
+        use_cache: bool = True
     ) -> List[MatchedCourse]:
-        """Scrape courses for a specific subject using Banner"""
-        
-        session = await self._get_session()
+        """_scrape_subject, coalescing concurrent calls for the same page into one request"""
+        key = (term, subject, open_only, use_cache)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # Shielded: a cancelled follower must not cancel the shared scrape
+            return await asyncio.shield(pending)
         
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
         try:
-            # Step 1: Initialize term selection
+            courses = await self._scrape_subject(term, subject, open_only, use_cache)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here; followers still get it raised
+            raise
+        else:
+            future.set_result(courses)
+            return courses
+        finally:
+            self._inflight.pop(key, None)
+    
+    async def _ensure_term(self, term: str):
+        """
+        Select the term in Banner once; later searches reuse the session
+        cookie it sets on the shared client
+        """
+        if term in self._term_initialized:
+            return
+        
+        async with self._term_lock:
+            if term in self._term_initialized:
+                return
+            
+            session = await self._get_session()
             form_url = f"{self.base_url}/bprod/bwckgens.p_proc_term_date"
-            term_data = {
-                "p_calling_proc": "bwckschd.p_disp_dyn_sched",
-                "p_term": term
-            }
+            term_data = {**_TERM_FORM, "p_term": term}
             
-            response = await session.post(form_url, data=term_data)
+            await self._rate_limiter.acquire()
+            response = await session.post(form_url, data=term_data, headers=self.headers)
             response.raise_for_status()
-            
-            # Step 2: Submit search criteria
+            self._term_initialized.add(term)
+    
+    async def _scrape_subject(
+        self,
+        term: str,
+        subject: str,
+        open_only: bool = False,
+        use_cache: bool = True
+    ) -> List[MatchedCourse]:
+        """
+        Scrape courses for a specific subject using Banner; open_only skips
+        full sections, use_cache=False bypasses (but still refreshes) the
+        on-disk response cache
+        """
+        
+        try:
+            # Search criteria (submitted in step 2)
             search_url = f"{self.base_url}/bprod/bwckschd.p_get_crse_unsec"
-            search_data = {
-                "term_in": term,
-                "sel_subj": ["dummy", subject],
-                "sel_day": "dummy",
-                "sel_schd": "dummy",
-                "sel_insm": "dummy",
-                "sel_camp": "dummy",
-                "sel_levl": "dummy",
-                "sel_sess": "dummy",
-                "sel_instr": "dummy",
-                "sel_ptrm": "dummy",
-                "sel_attr": "dummy",
-                "sel_crse": "",
-                "sel_title": "",
-                "sel_from_cred": "",
-                "sel_to_cred": "",
-                "sel_camp": "%",
-                "sel_ptrm": "%",
-                "sel_instr": "%",
-                "begin_hh": "0",
-                "begin_mi": "0",
-                "begin_ap": "a",
-                "end_hh": "0",
-                "end_mi": "0",
-                "end_ap": "a"
-            }
+            search_data = {**_SEARCH_FORM, "term_in": term, "sel_subj": ["dummy", subject]}
             
-            response = await session.post(search_url, data=search_data)
-            response.raise_for_status()
+            # Raw results page cached on disk skips both requests
+            disk_key = http_response_cache.make_key("POST", search_url, search_data)
+            html = await http_response_cache.get(disk_key) if use_cache else None
+            if html is not None:
+                return await asyncio.to_thread(
+                    self._parse_banner_schedule, html, subject, term, open_only
+                )
+            
+            session = await self._get_session()
+            
+            # Step 1: Initialize term selection (once per term per client)
+            await self._ensure_term(term)
+            
+            # Step 2: Submit search criteria. Courses are parsed chunk by
+            # chunk as the page arrives, on a thread of this page's own: the
+            # event loop never runs lxml/XPath work, the parser is only ever
+            # touched from one thread, and chunk N is parsed while chunk N+1
+            # downloads. The body is only kept when the disk cache needs it
+            await self._rate_limiter.acquire()
+            loop = asyncio.get_running_loop()
+            parser_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="banner-parse")
+            courses = []
+            try:
+                async with session.stream(
+                    "POST", search_url, data=search_data, headers=self.headers
+                ) as response:
+                    response.raise_for_status()
+                    encoding = response.charset_encoding or "utf-8"
+                    stream = await loop.run_in_executor(parser_thread, _CourseTableStream, encoding)
+                    chunks = [] if http_response_cache.enabled else None
+                    pending = None
+                    fed = False
+                    
+                    async for chunk in response.aiter_bytes():
+                        if not chunk:
+                            continue
+                        if pending is not None:
+                            courses.extend(await pending)
+                        pending = loop.run_in_executor(
+                            parser_thread, self._parse_chunk, stream, chunk, subject, term, open_only
+                        )
+                        fed = True
+                        if chunks is not None:
+                            chunks.append(chunk)
+                
+                if not fed:
+                    return []
+                courses.extend(await pending)
+                courses.extend(await loop.run_in_executor(
+                    parser_thread, self._parse_chunk, stream, None, subject, term, open_only
+                ))
+            finally:
+                parser_thread.shutdown(wait=False)
+            
+            if chunks is not None:
+                html = b"".join(chunks).decode(encoding, errors="replace")
+                await http_response_cache.set(disk_key, html, ttl=settings.cache_ttl_courses)
             
-            # Parse the results
-            courses = self._parse_banner_schedule(response.text, subject, term)
             return courses
             
         except httpx.HTTPError as e:
             logger.error(f"HTTP error scraping {subject}: {str(e)}")
+            # The term context may have expired; redo it on the next scrape
+            self._term_initialized.discard(term)
             raise
         except Exception as e:
             logger.error(f"Unexpected error scraping {subject}: {str(e)}")
             raise
     
-    def _parse_banner_schedule(self, html: str, subject: str, term: str) -> List[MatchedCourse]:
+    def _parse_banner_schedule(
+        self,
+        html: str,
+        subject: str,
+        term: str,
+        open_only: bool = False
+    ) -> List[MatchedCourse]:
         """
         Parse Banner schedule page HTML
         Banner uses a table-based layout with specific CSS classes
         """
-        soup = BeautifulSoup(html, 'lxml')
-        courses = []
+        if not html or not html.strip():
+            return []
         
         # Banner puts course data in tables with class "datadisplaytable"
         # Each course has two consecutive tables: header table and detail table
-        course_tables = soup.find_all('table', class_='datadisplaytable')
+        stream = _CourseTableStream()
+        courses = self._parse_table_pairs(stream.feed(html), subject, term, open_only)
+        courses.extend(self._parse_table_pairs(stream.close(), subject, term, open_only))
+        return courses
+    
+    def _parse_chunk(
+        self,
+        stream: _CourseTableStream,
+        chunk: Optional[bytes],
+        subject: str,
+        term: str,
+        open_only: bool = False
+    ) -> List[MatchedCourse]:
+        """Feed one chunk of the page (None finishes it) and parse the tables it completed"""
+        pairs = stream.close() if chunk is None else stream.feed(chunk)
+        return self._parse_table_pairs(pairs, subject, term, open_only)
+    
+    def _parse_table_pairs(
+        self,
+        pairs: Iterator[Tuple],
+        subject: str,
+        term: str,
+        open_only: bool = False
+    ) -> List[MatchedCourse]:
+        """Parse courses from (header, detail) table pairs"""
+        courses = []
         
-        i = 0
-        while i < len(course_tables) - 1:
+        for header_table, detail_table in pairs:
             try:
-                header_table = course_tables[i]
-                detail_table = course_tables[i + 1]
-                
-                # Skip if not a course header
-                caption = header_table.find('caption', class_='captiontext')
-                if not caption:
-                    i += 1
-                    continue
-                
-                course = self._parse_course_from_tables(header_table, detail_table, subject, term)
+                course = self._parse_course_from_tables(
+                    header_table, detail_table, subject, term, open_only
+                )
                 if course:
                     courses.append(course)
-                
-                i += 2  # Move to next course pair
-                
             except Exception as e:
                 logger.warning(f"Error parsing course table: {str(e)}")
-                i += 1
-                continue
         
         return courses
     
@@ -228,40 +605,41 @@ class PAWSScraper:
         header_table,
         detail_table,
         subject: str,
-        term: str
+        term: str,
+        open_only: bool = False
     ) -> Optional[MatchedCourse]:
-        """Parse a single course from Banner header and detail tables"""
+        """
+        Parse a single course from Banner header and detail tables;
+        with open_only, full sections return None before any row parsing
+        """
         
         try:
             # Parse header
-            caption = header_table.find('caption', class_='captiontext')
-            title_text = caption.get_text(strip=True)
+            caption = _XP_CAPTION(header_table)[0]
+            title_text = _text(caption, strip=True)
             
             # Title format: "Course Title - CRN - SUBJ NUM - Section"
             # Example: "Intro to Computer Science - 12345 - CSC 1301 - 01"
-            parts = [p.strip() for p in title_text.split(' - ')]
-            
-            if len(parts) < 4:
+            match = _CAPTION_RE.match(title_text)
+            if not match:
                 return None
             
-            title = parts[0]
-            crn = parts[1]
-            course_code_parts = parts[2].split()
-            section = parts[3]
+            title, crn, course_subject, course_number, section = match.groups()
             
-            if len(course_code_parts) < 2:
+            # Enrollment and credits both come from one pass over the tables' text
+            enrollment_info, credits = self._extract_meta(header_table, detail_table)
+            if open_only and (enrollment_info is None or enrollment_info.get('seats_available', 0) <= 0):
                 return None
             
-            course_subject = course_code_parts[0]
-            course_number = course_code_parts[1]
-            
-            # Parse detail table rows
-            detail_rows = detail_table.find_all('tr')
+            # Parse detail table rows; the first row holds the column headers
+            detail_rows = _XP_ROWS(detail_table)
+            pick_columns, min_cells = _detail_column_picker(tuple(
+                _text(th, strip=True) for th in _XP_HEADER_CELLS(detail_rows[0])
+            ) if detail_rows else ())
             
             # Initialize with defaults
-            credits = 3
             professor = None
-            days = []
+            days = Weekday(0)
             time_str = None
             location = None
             seats_available = 0
@@ -271,44 +649,40 @@ class PAWSScraper:
             
             # Parse detail rows (skip header)
             for row in detail_rows[1:]:
-                cells = row.find_all('td')
-                if len(cells) < 7:
+                cells = _XP_CELLS(row)
+                if len(cells) < min_cells:
                     continue
                 
-                # Column order: Type, Time, Days, Where, Date Range, Schedule Type, Instructors
-                meeting_time = cells[1].get_text(strip=True)
-                meeting_days = cells[2].get_text(strip=True)
-                meeting_location = cells[3].get_text(strip=True)
-                instructors = cells[6].get_text(strip=True)
+                time_cell, days_cell, location_cell, instructor_cell = pick_columns(cells)
+                meeting_time = _text(time_cell, strip=True)
+                meeting_days = _text(days_cell, strip=True)
+                meeting_location = _text(location_cell, strip=True)
+                instructors = _text(instructor_cell, strip=True)
                 
                 # Store first non-TBA values
                 if meeting_time and meeting_time != 'TBA' and not time_str:
                     time_str = meeting_time
                 
                 if meeting_days and meeting_days != 'TBA' and not days:
-                    # Parse days: "MWF" -> ["M", "W", "F"]
+                    # Parse days: "MWF" -> Weekday.M | W | F
                     days = self._parse_days(meeting_days)
                 
                 if meeting_location and meeting_location != 'TBA' and not location:
                     location = meeting_location
                     # Check if online
-                    if any(keyword in location.upper() for keyword in ['ONLINE', 'WEB', 'INTERNET', 'VIRTUAL']):
+                    if _ONLINE_RE.search(location):
                         delivery_method = "Online"
                 
                 if instructors and instructors != 'TBA' and not professor:
                     # Clean up professor name
                     professor = self._clean_professor_name(instructors)
             
-            # Try to find enrollment information
-            # Banner sometimes has this in a separate table or link
-            enrollment_info = self._extract_enrollment_info(header_table, detail_table)
             if enrollment_info:
                 seats_available = enrollment_info.get('seats_available', 0)
                 total_seats = enrollment_info.get('total_seats', 0)
                 waitlist_available = enrollment_info.get('waitlist_available', 0)
             
-            # Try to extract credits
-            credits = self._extract_credits(header_table, detail_table) or 3
+            credits = credits or 3
             
             return MatchedCourse(
                 crn=crn,
@@ -330,23 +704,14 @@ class PAWSScraper:
             logger.warning(f"Error parsing course: {str(e)}")
             return None
     
-    def _parse_days(self, days_str: str) -> List[str]:
+    def _parse_days(self, days_str: str) -> Weekday:
         """
-        Parse day string into list of individual days
+        Parse day string into day flags
         Handles formats like "MWF", "TR", "M", etc.
         """
         if not days_str or days_str == 'TBA':
-            return []
-        
-        # Banner uses: M, T, W, R (Thursday), F, S (Saturday), U (Sunday)
-        days = []
-        i = 0
-        while i < len(days_str):
-            if days_str[i] in ['M', 'T', 'W', 'R', 'F', 'S', 'U']:
-                days.append(days_str[i])
-            i += 1
-        
-        return days
+            return Weekday(0)
+        return _parse_days_cached(days_str)
     
     def _clean_professor_name(self, name: str) -> str:
         """Clean and format professor name"""
@@ -354,31 +719,44 @@ class PAWSScraper:
         name = ' '.join(name.split())
         
         # Remove titles
-        name = re.sub(r'\b(Dr\.|Prof\.|Mr\.|Ms\.|Mrs\.)\s*', '', name, flags=re.IGNORECASE)
+        name = _TITLE_RE.sub('', name)
         
         # Remove email if present
-        name = re.sub(r'\s*\([^)]*@[^)]*\)', '', name)
+        name = _EMAIL_RE.sub('', name)
         
         # Remove (P) or similar indicators
-        name = re.sub(r'\s*\([A-Z]\)', '', name)
+        name = _INITIAL_RE.sub('', name)
         
         return name.strip()
     
-    def _extract_enrollment_info(self, header_table, detail_table) -> Optional[Dict]:
+    def _extract_meta(self, header_table, detail_table) -> Tuple[Optional[Dict], Optional[int]]:
+        """Enrollment info and credit hours from one regex pass over both tables' text"""
+        first = {}
+        for match in _META_RE.finditer(_text(header_table) + _text(detail_table)):
+            first.setdefault(match.lastgroup, match.group(match.lastgroup))
+        
+        seats = next((first[g] for g in _SEATS_GROUPS if g in first), None)
+        credits = next((first[g] for g in _CREDIT_GROUPS if g in first), None)
+        return (
+            self._extract_enrollment_info(header_table, seats),
+            int(float(credits)) if credits is not None else None
+        )
+    
+    def _extract_enrollment_info(self, header_table, seats: Optional[str]) -> Optional[Dict]:
         """
         Extract seat availability from Banner tables
         Banner may have this in various formats
         """
         # Look for enrollment link in header table
-        enrollment_link = header_table.find('a', href=re.compile(r'bwckschd\.p_disp_detail_sched'))
+        enrollment_links = _XP_ENROLL_LINK(header_table)
         
-        if enrollment_link:
+        if enrollment_links:
             # Parse the enrollment text
             # Common format: "Seats: 5/30" or "Available: 5 of 30"
-            text = enrollment_link.get_text()
+            text = _text(enrollment_links[0])
             
             # Try pattern: "X/Y" or "X of Y"
-            match = re.search(r'(\d+)\s*(?:/|of)\s*(\d+)', text)
+            match = _SEATS_XY_RE.search(text)
             if match:
                 available = int(match.group(1))
                 total = int(match.group(2))
@@ -388,77 +766,58 @@ class PAWSScraper:
                     'waitlist_available': 0
                 }
         
-        # Alternative: look in all table text
-        all_text = header_table.get_text() + detail_table.get_text()
-        
-        # Try various patterns
-        patterns = [
-            r'Seats\s+Avail[^:]*:\s*(\d+)',
-            r'Available:\s*(\d+)',
-            r'(\d+)\s+(?:seats?\s+)?remain',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, all_text, re.IGNORECASE)
-            if match:
-                return {
-                    'seats_available': int(match.group(1)),
-                    'total_seats': 0,  # Unknown
-                    'waitlist_available': 0
-                }
-        
-        return None
-    
-    def _extract_credits(self, header_table, detail_table) -> Optional[int]:
-        """Extract credit hours from tables"""
-        all_text = header_table.get_text() + detail_table.get_text()
-        
-        # Look for credit patterns
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s+Credits?',
-            r'Credits?:\s*(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)\s+(?:Credit\s+)?Hours?',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, all_text, re.IGNORECASE)
-            if match:
-                try:
-                    return int(float(match.group(1)))
-                except ValueError:
-                    continue
+        # Alternative: the seat count found in all table text
+        if seats is not None:
+            return {
+                'seats_available': int(seats),
+                'total_seats': 0,  # Unknown
+                'waitlist_available': 0
+            }
         
         return None
     
     async def _store_courses_in_db(self, courses: List[MatchedCourse], term: str):
-        """Store courses in database for persistent caching"""
+        """Store courses in database for persistent caching (COPY on asyncpg, else one bulk upsert)"""
+        if not courses:
+            return
+        
         try:
             async with AsyncSessionLocal() as session:
-                expires_at = datetime.utcnow() + timedelta(seconds=settings.cache_ttl_courses)
+                now = datetime.utcnow()
+                expires_at = now + timedelta(seconds=settings.cache_ttl_courses)
                 
-                for course in courses:
-                    # Check if course already exists
-                    db_course = CourseCache(
-                        crn=course.crn,
-                        term=term,
-                        subject=course.subject,
-                        course_number=course.course_number,
-                        section=course.section,
-                        title=course.title,
-                        credits=course.credits,
-                        professor=course.professor,
-                        days=course.days,
-                        time_start=course.time,
-                        time_end=None,
-                        location=course.location,
-                        seats_available=course.seats_available,
-                        total_seats=course.total_seats,
-                        delivery_method=course.delivery_method,
-                        raw_data=course.dict(),
-                        expires_at=expires_at
-                    )
-                    session.add(db_course)
+                # Keyed by CRN: Postgres rejects an upsert touching one row twice
+                rows = {
+                    course.crn: {
+                        "crn": course.crn,
+                        "term": term,
+                        "subject": course.subject,
+                        "course_number": course.course_number,
+                        "section": course.section,
+                        "title": course.title,
+                        "credits": course.credits,
+                        "professor": course.professor,
+                        "days": course.days.codes(),
+                        "time_start": course.time,
+                        "time_end": None,
+                        "location": course.location,
+                        "seats_available": course.seats_available,
+                        "total_seats": course.total_seats,
+                        "waitlist_available": 0,
+                        "delivery_method": course.delivery_method,
+                        "raw_data": course.model_dump(),
+                        "created_at": now,
+                        "updated_at": now,
+                        "expires_at": expires_at,
+                    }
+                    for course in courses
+                }
                 
+                dialect = session.bind.dialect
+                if dialect.name == "postgresql" and dialect.driver == "asyncpg":
+                    await _copy_courses(session, term, list(rows.values()))
+                else:
+                    await session.execute(_course_upsert(dialect.name, list(rows.values())))
                 await session.commit()
                 logger.info(f"Stored {len(courses)} courses in database")
                 
@@ -472,65 +831,119 @@ class PAWSScraper:
         items_found: int,
         duration_ms: int
     ):
-        """Log successful scraping operation"""
+        """Log successful scraping operation (batched write)"""
         try:
-            async with AsyncSessionLocal() as session:
-                log = ScraperLog(
-                    source="paws",
-                    operation="get_courses",
-                    status="success",
-                    term=term,
-                    query_params={"subjects": subjects},
-                    items_found=items_found,
-                    duration_ms=duration_ms
-                )
-                session.add(log)
-                await session.commit()
+            await scraper_log_batcher.process(ScraperLog(
+                source="paws",
+                operation="get_courses",
+                status="success",
+                term=term,
+                query_params={"subjects": subjects},
+                items_found=items_found,
+                duration_ms=duration_ms
+            ))
         except Exception as e:
             logger.error(f"Error logging scraper success: {e}")
     
     async def _log_scraper_error(self, term: str, subject: str, error_msg: str):
-        """Log scraping error"""
+        """Log scraping error (batched write)"""
         try:
-            async with AsyncSessionLocal() as session:
-                log = ScraperLog(
-                    source="paws",
-                    operation="get_courses",
-                    status="error",
-                    term=term,
-                    subject=subject,
-                    error_message=error_msg[:500]
-                )
-                session.add(log)
-                await session.commit()
+            await scraper_log_batcher.process(ScraperLog(
+                source="paws",
+                operation="get_courses",
+                status="error",
+                term=term,
+                subject=subject,
+                error_message=error_msg[:500]
+            ))
         except Exception as e:
             logger.error(f"Error logging scraper error: {e}")
     
-    async def search_courses(
+    async def iter_search_courses(
         self,
         term: str,
         subject: Optional[str] = None,
         course_number: Optional[str] = None,
-        keyword: Optional[str] = None
-    ) -> List[Dict]:
-        """Search for specific courses"""
-        subjects = [subject] if subject else []
-        courses = await self.get_available_courses(term, subjects, open_only=False)
+        keyword: Optional[str] = None,
+        use_cache: bool = True
+    ) -> AsyncIterator[Dict]:
+        """Search for specific courses, yielding matches one dict at a time"""
+        if not subject:
+            # Nothing is scraped without a subject; never scan the whole term
+            return
         
-        # Apply filters
-        if course_number:
-            courses = [c for c in courses if c.course_number == course_number]
+        # Fast path: filter live cached rows in SQL (idx_course_live). The
+        # database only answers the search if the stream completes; after a
+        # failure the scrape below fills in whatever was not yet yielded
+        seen = set()
+        if use_cache:
+            try:
+                async for row in self._search_db(term, subject, course_number, keyword):
+                    seen.add(row.get("crn"))
+                    yield row
+            except Exception as e:
+                logger.error(f"Error searching course cache: {e}")
+            else:
+                if seen:
+                    return
+        
+        courses = await self.get_available_courses(
+            term, [subject], open_only=False, use_cache=use_cache
+        )
+        keyword_lower = keyword.lower() if keyword else None
         
+        for c in courses:
+            # Apply filters
+            if c.crn in seen:
+                continue
+            if course_number and c.course_number != course_number:
+                continue
+            if keyword_lower and not (
+                keyword_lower in c.title.lower() or
+                keyword_lower in f"{c.subject}{c.course_number}".lower()
+            ):
+                continue
+            yield c.model_dump()
+    
+    async def _search_db(
+        self,
+        term: str,
+        subject: str,
+        course_number: Optional[str],
+        keyword: Optional[str]
+    ) -> AsyncIterator[Dict]:
+        """Stream non-expired course_cache rows matching the search"""
+        stmt = select(CourseCache.raw_data).where(
+            CourseCache.term == term,
+            CourseCache.subject == subject,
+            CourseCache.expires_at > datetime.utcnow()
+        )
+        if course_number:
+            stmt = stmt.where(CourseCache.course_number == course_number)
         if keyword:
-            keyword_lower = keyword.lower()
-            courses = [
-                c for c in courses
-                if keyword_lower in c.title.lower() or
-                   keyword_lower in f"{c.subject}{c.course_number}".lower()
-            ]
+            stmt = stmt.where(or_(
+                CourseCache.title.icontains(keyword, autoescape=True),
+                (CourseCache.subject + CourseCache.course_number).icontains(keyword, autoescape=True)
+            ))
         
-        return [c.dict() for c in courses]
+        async with AsyncSessionLocal() as session:
+            rows = await session.stream_scalars(stmt.order_by(CourseCache.id))
+            async for raw_data in rows:
+                yield raw_data
+    
+    async def search_courses(
+        self,
+        term: str,
+        subject: Optional[str] = None,
+        course_number: Optional[str] = None,
+        keyword: Optional[str] = None,
+        use_cache: bool = True
+    ) -> List[Dict]:
+        """Search for specific courses"""
+        return [
+            c async for c in self.iter_search_courses(term, subject, course_number, keyword, use_cache)
+        ]
     
     def generate_registration_link(self, term: str) -> str:
         """Generate PAWS registration link"""
-        return f"{self.base_url}/bprod/twbkwbis.P_GenMenu?name=bmenu.P_RegMnu&term={term}"
+        return _registration_link(self.base_url, term)
@@ -3,22 +3,106 @@ RateMyProfessors Scraper - Production Version
 Real GraphQL API implementation with caching and retry logic
 """
 import httpx
-from typing import Optional, Dict
+import orjson
+from typing import Optional, Dict, List
 import logging
+import asyncio
+import time
+from functools import lru_cache
 from datetime import datetime, timedelta
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 
 from config import settings
-from cache import cache_manager, professor_cache_key
-from database import AsyncSessionLocal, ProfessorCache, ScraperLog
+from cache import cache_manager, http_response_cache, professor_cache_key
+from database import AsyncSessionLocal, ProfessorCache, ScraperLog, scraper_log_batcher
+from utils.lru import LRUDict
+from utils.rate_limiter import AsyncRateLimiter
 
 logger = logging.getLogger(__name__)
 
 
+# Teacher fields requested from RMP, shared by single and batched searches.
+# Only what _find_best_match and _build_result read: no ids beyond
+# legacyId, no cursors/pageInfo, keeping responses small
+TEACHER_FIELDS_FRAGMENT = """
+fragment TeacherFields on Teacher {
+  legacyId
+  firstName
+  lastName
+  school {
+    name
+  }
+  department
+  avgRating
+  avgDifficulty
+  wouldTakeAgainPercent
+  numRatings
+  courseCodes {
+    courseName
+    courseCount
+  }
+}
+"""
+
+
+@lru_cache(maxsize=None)
+def build_batch_teacher_query(count: int) -> str:
+    """
+    Build one GraphQL document searching for `count` teachers at once
+    
+    Each search is an aliased newSearch field (p0, p1, ...) bound to its
+    own $q0, $q1, ... variable. Counts are bounded by rmp_batch_size, so
+    each document is built once and memoized.
+    """
+    params = ", ".join(f"$q{i}: TeacherSearchQuery!" for i in range(count))
+    fields = "\n".join(
+        f"  p{i}: newSearch {{ teachers(query: $q{i}) {{ edges {{ node {{ ...TeacherFields }} }} }} }}"
+        for i in range(count)
+    )
+    return f"query BatchSearchTeachersQuery({params}) {{\n{fields}\n}}\n{TEACHER_FIELDS_FRAGMENT}"
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Timeouts, connection failures and 429 responses are worth retrying"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429
+    return isinstance(exc, (httpx.TimeoutException, httpx.NetworkError))
+
+
+def _retry_after_seconds(response: httpx.Response, limit: float = 30.0) -> float:
+    """Delay requested by a Retry-After header (seconds form), capped at limit"""
+    try:
+        return min(max(float(response.headers.get("Retry-After", 0)), 0.0), limit)
+    except ValueError:
+        return 0.0
+
+
+def _professor_upsert(dialect: str, rows: List[Dict]):
+    """Single multi-row INSERT for ProfessorCache, refreshing rows already cached for (name, school)"""
+    if dialect == "postgresql":
+        stmt = pg_insert(ProfessorCache).values(rows)
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(ProfessorCache).values(rows)
+    else:
+        return insert(ProfessorCache).values(rows)
+    
+    refreshed = {
+        key: stmt.excluded[key]
+        for key in rows[0]
+        if key not in ("professor_name", "school_id", "created_at")
+    }
+    return stmt.on_conflict_do_update(
+        index_elements=["professor_name", "school_id"], set_=refreshed
+    )
+
+
 class RateMyProfessorsScraper:
     """Production scraper for RateMyProfessors using GraphQL API"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[httpx.AsyncClient] = None):
         self.base_url = settings.rmp_base_url
         self.graphql_url = settings.rmp_graphql_url
         self.school_id = settings.rmp_school_id
@@ -28,31 +112,42 @@ class RateMyProfessorsScraper:
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
-        self._session: Optional[httpx.AsyncClient] = None
+        # A shared client may be injected (see main.lifespan); it is owned
+        # by the caller and never closed here
+        self._session: Optional[httpx.AsyncClient] = session
+        self._owns_session = session is None
         
-        # Cache to avoid repeated lookups in same session
-        self._memory_cache = {}
+        # Cache to avoid repeated lookups in same session; bounded so a
+        # long-running process does not grow it forever
+        self._memory_cache = LRUDict(maxsize=settings.rmp_memory_cache_size)
+        # Paces GraphQL requests across concurrent lookups and batches
+        self._rate_limiter = AsyncRateLimiter(settings.rmp_requests_per_second)
     
     async def _get_session(self) -> httpx.AsyncClient:
         """Get or create HTTP session"""
+        if not self._owns_session:
+            return self._session
+        
         if self._session is None or self._session.is_closed:
+            # Same pooled HTTP/2 setup as PAWSScraper: GraphQL calls
+            # multiplex over one kept-alive connection
             self._session = httpx.AsyncClient(
+                http2=True,
                 timeout=settings.scraper_timeout,
                 headers=self.headers,
-                follow_redirects=True
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=settings.scraper_concurrent_requests,
+                    max_keepalive_connections=settings.scraper_concurrent_requests
+                )
             )
         return self._session
     
     async def close(self):
         """Close HTTP session"""
-        if self._session and not self._session.is_closed:
+        if self._owns_session and self._session and not self._session.is_closed:
             await self._session.aclose()
     
-    @retry(
-        stop=stop_after_attempt(settings.scraper_max_retries),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.NetworkError))
-    )
     async def get_professor_rating(
         self,
         professor_name: str,
@@ -70,7 +165,7 @@ class RateMyProfessorsScraper:
         Returns:
             Dict with rating data or None if not found
         """
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         
         # Check memory cache first
         cache_key = professor_cache_key(professor_name)
@@ -78,9 +173,9 @@ class RateMyProfessorsScraper:
             logger.info(f"Memory cache hit for {professor_name}")
             return self._memory_cache[cache_key]
         
-        # Check Redis cache
+        # Check Redis cache; a hit keeps the rating warm for another TTL
         if use_cache:
-            cached_data = await cache_manager.get(cache_key)
+            cached_data = await cache_manager.get_and_refresh(cache_key, settings.cache_ttl_professor)
             if cached_data:
                 logger.info(f"Redis cache hit for {professor_name}")
                 self._memory_cache[cache_key] = cached_data
@@ -98,7 +193,9 @@ class RateMyProfessorsScraper:
         # Fetch fresh data
         try:
             logger.info(f"Fetching fresh data for {professor_name}")
-            professor_data = await self._search_professor(professor_name, self.school_id)
+            professor_data = await self._search_professor(
+                professor_name, self.school_id, use_cache=use_cache
+            )
             
             if professor_data:
                 # Cache the result
@@ -112,7 +209,7 @@ class RateMyProfessorsScraper:
                 
                 self._memory_cache[cache_key] = professor_data
                 
-                duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+                duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
                 await self._log_success(professor_name, duration_ms)
                 
                 return professor_data
@@ -129,7 +226,8 @@ class RateMyProfessorsScraper:
     async def _search_professor(
         self,
         professor_name: str,
-        school_id: str
+        school_id: str,
+        use_cache: bool = True
     ) -> Optional[Dict]:
         """
         Search for professor using RMP GraphQL API
@@ -152,35 +250,14 @@ class RateMyProfessorsScraper:
           newSearch {
             teachers(query: $query) {
               edges {
-                cursor
                 node {
-                  id
-                  legacyId
-                  firstName
-                  lastName
-                  school {
-                    name
-                    id
-                  }
-                  department
-                  avgRating
-                  avgDifficulty
-                  wouldTakeAgainPercent
-                  numRatings
-                  courseCodes {
-                    courseName
-                    courseCount
-                  }
+                  ...TeacherFields
                 }
               }
-              pageInfo {
-                hasNextPage
-                endCursor
-              }
             }
           }
         }
-        """
+        """ + TEACHER_FIELDS_FRAGMENT
         
         variables = {
             "query": {
@@ -191,15 +268,10 @@ class RateMyProfessorsScraper:
             }
         }
         
-        session = await self._get_session()
-        
         try:
-            response = await session.post(
-                self.graphql_url,
-                json={"query": query, "variables": variables}
+            data = await self._post_graphql(
+                {"query": query, "variables": variables}, use_cache=use_cache
             )
-            response.raise_for_status()
-            data = response.json()
             
             # Check for errors
             if "errors" in data:
@@ -217,33 +289,7 @@ class RateMyProfessorsScraper:
             best_match = self._find_best_match(teachers, first_name, last_name)
             
             if best_match:
-                node = best_match["node"]
-                
-                # Extract top courses
-                top_courses = []
-                if node.get("courseCodes"):
-                    top_courses = [
-                        course["courseName"] 
-                        for course in sorted(
-                            node["courseCodes"],
-                            key=lambda x: x.get("courseCount", 0),
-                            reverse=True
-                        )[:5]
-                    ]
-                
-                result = {
-                    "rating": node.get("avgRating"),
-                    "difficulty": node.get("avgDifficulty"),
-                    "would_take_again": node.get("wouldTakeAgainPercent"),
-                    "num_ratings": node.get("numRatings", 0),
-                    "department": node.get("department"),
-                    "professor_id": node.get("legacyId") or node.get("id"),
-                    "first_name": node.get("firstName"),
-                    "last_name": node.get("lastName"),
-                    "school_name": node.get("school", {}).get("name"),
-                    "top_courses": top_courses,
-                    "rmp_url": f"{self.base_url}/professor/{node.get('legacyId')}" if node.get('legacyId') else None
-                }
+                result = self._build_result(best_match["node"])
                 
                 logger.info(f"Found match for {professor_name}: {result['rating']}/5.0")
                 return result
@@ -258,6 +304,128 @@ class RateMyProfessorsScraper:
             logger.error(f"Unexpected error searching for professor: {str(e)}")
             raise
     
+    async def _post_graphql(self, payload: Dict, use_cache: bool = True) -> Dict:
+        """
+        POST a GraphQL request, served from the on-disk response cache
+        when the identical request was made within the professor TTL;
+        use_cache=False skips the read but still refreshes the entry
+        """
+        disk_key = http_response_cache.make_key("POST", self.graphql_url, payload)
+        if use_cache:
+            cached = await http_response_cache.get(disk_key)
+            if cached is not None:
+                return cached
+        
+        data = await self._send_graphql(orjson.dumps(payload))
+        
+        # Never persist error responses
+        if "errors" not in data:
+            await http_response_cache.set(disk_key, data, ttl=settings.cache_ttl_professor)
+        
+        return data
+    
+    @retry(
+        stop=stop_after_attempt(settings.scraper_max_retries),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception(_is_retryable)
+    )
+    async def _send_graphql(self, body: bytes) -> Dict:
+        """
+        The network part of _post_graphql: the only step that is retried,
+        paced by the RMP rate limiter
+        """
+        session = await self._get_session()
+        await self._rate_limiter.acquire()
+        # orjson both ways: RMP responses are deeply nested and can hold
+        # many teacher edges; self.headers already sets the JSON content type
+        response = await session.post(self.graphql_url, content=body, headers=self.headers)
+        
+        if response.status_code == 429:
+            # Honor the server's back-off before tenacity schedules the retry
+            await asyncio.sleep(_retry_after_seconds(response))
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def _build_result(self, node: Dict) -> Dict:
+        """Convert a matched RMP teacher node into our rating dict"""
+        # Extract top courses
+        top_courses = []
+        if node.get("courseCodes"):
+            top_courses = [
+                course["courseName"] 
+                for course in sorted(
+                    node["courseCodes"],
+                    key=lambda x: x.get("courseCount", 0),
+                    reverse=True
+                )[:5]
+            ]
+        
+        return {
+            "rating": node.get("avgRating"),
+            "difficulty": node.get("avgDifficulty"),
+            "would_take_again": node.get("wouldTakeAgainPercent"),
+            "num_ratings": node.get("numRatings", 0),
+            "department": node.get("department"),
+            "professor_id": node.get("legacyId"),
+            "first_name": node.get("firstName"),
+            "last_name": node.get("lastName"),
+            "school_name": node.get("school", {}).get("name"),
+            "top_courses": top_courses,
+            "rmp_url": f"{self.base_url}/professor/{node.get('legacyId')}" if node.get('legacyId') else None
+        }
+    
+    async def _search_professors_batch(
+        self,
+        professor_names: list[str],
+        school_id: str
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Search for several professors with a single GraphQL request
+        
+        Returns:
+            Dict mapping each name to its rating data (None if not found)
+        """
+        results: Dict[str, Optional[Dict]] = {}
+        
+        # Names that can't be split into first/last are never searched
+        searchable = []
+        for name in professor_names:
+            if len(name.strip().split()) < 2:
+                logger.warning(f"Invalid professor name format: {name}")
+                results[name] = None
+            else:
+                searchable.append(name)
+        
+        if not searchable:
+            return results
+        
+        variables = {
+            f"q{i}": {
+                "text": name,
+                "schoolID": school_id,
+                "fallback": True,
+                "departmentID": None
+            }
+            for i, name in enumerate(searchable)
+        }
+        
+        data = await self._post_graphql({
+            "query": build_batch_teacher_query(len(searchable)),
+            "variables": variables
+        })
+        
+        if "errors" in data:
+            logger.error(f"GraphQL errors: {data['errors']}")
+        
+        payload = data.get("data") or {}
+        for i, name in enumerate(searchable):
+            teachers = ((payload.get(f"p{i}") or {}).get("teachers") or {}).get("edges", [])
+            name_parts = name.strip().split()
+            best_match = self._find_best_match(teachers, name_parts[0], name_parts[-1])
+            results[name] = self._build_result(best_match["node"]) if best_match else None
+        
+        return results
+    
     def _find_best_match(
         self,
         teachers: list,
@@ -273,23 +441,28 @@ class RateMyProfessorsScraper:
         - Has ratings
         """
         
-        candidates = []
+        first_lower = first_name.lower()
+        last_lower = last_name.lower()
+        first_initial = first_lower[:1]
+        
+        # Single pass keeping the highest score; ties keep the earlier result
+        best_score = None
+        best_teacher = None
         
         for teacher_edge in teachers:
             node = teacher_edge["node"]
-            teacher_first = node.get("firstName", "").lower()
-            teacher_last = node.get("lastName", "").lower()
             
             # Must match last name
-            if teacher_last != last_name.lower():
+            if node.get("lastName", "").lower() != last_lower:
                 continue
             
             score = 100  # Base score for last name match
             
             # First name scoring
-            if teacher_first == first_name.lower():
+            teacher_first = node.get("firstName", "").lower()
+            if teacher_first == first_lower:
                 score += 50  # Exact match
-            elif teacher_first.startswith(first_name[0].lower()):
+            elif teacher_first.startswith(first_initial):
                 score += 25  # Initial match
             else:
                 score -= 20  # No match
@@ -301,15 +474,12 @@ class RateMyProfessorsScraper:
             else:
                 score -= 30  # Penalty for no ratings
             
-            candidates.append((score, teacher_edge))
+            if best_score is None or score > best_score:
+                best_score, best_teacher = score, teacher_edge
         
-        if not candidates:
+        if best_teacher is None:
             return None
         
-        # Return highest scoring candidate
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        best_score, best_teacher = candidates[0]
-        
         if best_score < 80:  # Threshold for accepting a match
             logger.warning(f"Best match score {best_score} is below threshold")
             return None
@@ -318,19 +488,23 @@ class RateMyProfessorsScraper:
     
     async def _get_from_db(self, professor_name: str) -> Optional[Dict]:
         """Get professor data from database cache"""
+        return (await self._get_many_from_db([professor_name])).get(professor_name)
+    
+    async def _get_many_from_db(self, professor_names: List[str]) -> Dict[str, Dict]:
+        """Get unexpired professor data for several names with one query"""
+        if not professor_names:
+            return {}
+        
         try:
             async with AsyncSessionLocal() as session:
-                from sqlalchemy import select
-                
                 stmt = select(ProfessorCache).where(
-                    ProfessorCache.professor_name == professor_name,
+                    ProfessorCache.professor_name.in_(set(professor_names)),
                     ProfessorCache.expires_at > datetime.utcnow()
                 )
-                result = await session.execute(stmt)
-                prof = result.scalar_one_or_none()
+                result = await session.scalars(stmt)
                 
-                if prof:
-                    return {
+                return {
+                    prof.professor_name: {
                         "rating": prof.avg_rating,
                         "difficulty": prof.avg_difficulty,
                         "would_take_again": prof.would_take_again_percent,
@@ -339,107 +513,88 @@ class RateMyProfessorsScraper:
                         "professor_id": prof.rmp_id,
                         "tags": prof.tags
                     }
-                
-                return None
+                    for prof in result
+                }
                 
         except Exception as e:
             logger.error(f"Error reading from database: {e}")
-            return None
+            return {}
     
     async def _store_in_db(self, professor_name: str, data: Dict):
         """Store professor data in database"""
+        await self._store_many_in_db({professor_name: data})
+    
+    async def _store_many_in_db(self, ratings: Dict[str, Dict]):
+        """Store several professors' data in database (one bulk upsert)"""
+        if not ratings:
+            return
+        
         try:
             async with AsyncSessionLocal() as session:
-                from sqlalchemy import select
-                
-                # Check if exists
-                stmt = select(ProfessorCache).where(
-                    ProfessorCache.professor_name == professor_name
-                )
-                result = await session.execute(stmt)
-                prof = result.scalar_one_or_none()
-                
-                expires_at = datetime.utcnow() + timedelta(seconds=settings.cache_ttl_professor)
-                
-                if prof:
-                    # Update existing
-                    prof.avg_rating = data.get("rating")
-                    prof.avg_difficulty = data.get("difficulty")
-                    prof.would_take_again_percent = data.get("would_take_again")
-                    prof.num_ratings = data.get("num_ratings")
-                    prof.department = data.get("department")
-                    prof.rmp_id = data.get("professor_id")
-                    prof.raw_data = data
-                    prof.updated_at = datetime.utcnow()
-                    prof.expires_at = expires_at
-                else:
-                    # Create new
-                    prof = ProfessorCache(
-                        professor_name=professor_name,
-                        school_id=self.school_id,
-                        rmp_id=data.get("professor_id"),
-                        avg_rating=data.get("rating"),
-                        avg_difficulty=data.get("difficulty"),
-                        would_take_again_percent=data.get("would_take_again"),
-                        num_ratings=data.get("num_ratings"),
-                        department=data.get("department"),
-                        raw_data=data,
-                        expires_at=expires_at
-                    )
-                    session.add(prof)
+                now = datetime.utcnow()
+                expires_at = now + timedelta(seconds=settings.cache_ttl_professor)
+                rows = [
+                    {
+                        "professor_name": professor_name,
+                        "school_id": self.school_id,
+                        "rmp_id": data.get("professor_id"),
+                        "avg_rating": data.get("rating"),
+                        "avg_difficulty": data.get("difficulty"),
+                        "would_take_again_percent": data.get("would_take_again"),
+                        "num_ratings": data.get("num_ratings"),
+                        "department": data.get("department"),
+                        "raw_data": data,
+                        "created_at": now,
+                        "updated_at": now,
+                        "expires_at": expires_at,
+                    }
+                    for professor_name, data in ratings.items()
+                ]
                 
+                await session.execute(_professor_upsert(session.bind.dialect.name, rows))
                 await session.commit()
-                logger.info(f"Stored professor {professor_name} in database")
+                logger.info(f"Stored {len(rows)} professors in database")
                 
         except Exception as e:
             logger.error(f"Error storing in database: {e}")
     
     async def _log_success(self, professor_name: str, duration_ms: int):
-        """Log successful lookup"""
+        """Log successful lookup (batched write)"""
         try:
-            async with AsyncSessionLocal() as session:
-                log = ScraperLog(
-                    source="rmp",
-                    operation="get_professor",
-                    status="success",
-                    query_params={"professor": professor_name},
-                    items_found=1,
-                    duration_ms=duration_ms
-                )
-                session.add(log)
-                await session.commit()
+            await scraper_log_batcher.process(ScraperLog(
+                source="rmp",
+                operation="get_professor",
+                status="success",
+                query_params={"professor": professor_name},
+                items_found=1,
+                duration_ms=duration_ms
+            ))
         except Exception as e:
             logger.error(f"Error logging success: {e}")
     
     async def _log_not_found(self, professor_name: str):
-        """Log professor not found"""
+        """Log professor not found (batched write)"""
         try:
-            async with AsyncSessionLocal() as session:
-                log = ScraperLog(
-                    source="rmp",
-                    operation="get_professor",
-                    status="not_found",
-                    query_params={"professor": professor_name},
-                    items_found=0
-                )
-                session.add(log)
-                await session.commit()
+            await scraper_log_batcher.process(ScraperLog(
+                source="rmp",
+                operation="get_professor",
+                status="not_found",
+                query_params={"professor": professor_name},
+                items_found=0
+            ))
         except Exception as e:
             logger.error(f"Error logging not found: {e}")
     
     async def _log_error(self, professor_name: str, error_msg: str):
-        """Log error"""
+        """Log error (batched write)"""
         try:
-            async with AsyncSessionLocal() as session:
-                log = ScraperLog(
-                    source="rmp",
-                    operation="get_professor",
-                    status="error",
-                    query_params={"professor": professor_name},
-                    error_message=error_msg[:500]
-                )
-                session.add(log)
-                await session.commit()
+            await scraper_log_batcher.process(ScraperLog(
+                source="rmp",
+                operation="get_professor",
+                status="error",
+                query_params={"professor": professor_name},
+                error_message=error_msg[:500]
+            ))
         except Exception as e:
             logger.error(f"Error logging error: {e}")
     
@@ -462,23 +617,85 @@ class RateMyProfessorsScraper:
         Returns:
             Dict mapping professor names to their rating data
         """
+        start_ns = time.perf_counter_ns()
         results = {}
         
-        # Check cache for all professors first
-        cache_keys = [professor_cache_key(name) for name in professor_names]
-        cached_data = await cache_manager.get_many(cache_keys)
+        # Memory cache first; only the remaining keys go to Redis (one
+        # pipelined GETEX round-trip that also slides their TTL).
+        # Keys are computed once here and reused for every later cache write
+        miss_keys = {}
+        for name in dict.fromkeys(professor_names):  # one lookup per distinct name
+            cache_key = professor_cache_key(name)
+            if cache_key in self._memory_cache:
+                results[name] = self._memory_cache[cache_key]
+            else:
+                miss_keys[name] = cache_key
+        cached_data = await cache_manager.get_many_and_refresh(
+            list(miss_keys.values()), settings.cache_ttl_professor
+        )
         
         # Separate cached and uncached
         to_fetch = []
-        for name, cache_key in zip(professor_names, cache_keys):
+        for name, cache_key in miss_keys.items():
             if cache_key in cached_data:
                 results[name] = cached_data[cache_key]
+                self._memory_cache[cache_key] = cached_data[cache_key]
             else:
                 to_fetch.append(name)
         
-        # Fetch uncached professors
+        # Fall back to the database cache before hitting RMP (one query)
+        db_results = await self._get_many_from_db(to_fetch)
+        to_search = []
         for name in to_fetch:
-            rating = await self.get_professor_rating(name, school)
-            results[name] = rating
+            db_data = db_results.get(name)
+            if db_data:
+                results[name] = db_data
+                self._memory_cache[miss_keys[name]] = db_data
+            else:
+                to_search.append(name)
+        
+        # Bounds concurrent outbound requests below
+        semaphore = asyncio.Semaphore(settings.scraper_concurrent_requests)
+        
+        async def search(batch: list[str]) -> Optional[Dict[str, Optional[Dict]]]:
+            async with semaphore:
+                try:
+                    return await self._search_professors_batch(batch, self.school_id)
+                except Exception as e:
+                    logger.error(f"Error batch fetching ratings: {str(e)}")
+                    for name in batch:
+                        await self._log_error(name, str(e))
+                    return None
+        
+        # Fetch the rest from RMP, one GraphQL request per batch, batches in parallel
+        batch_size = settings.rmp_batch_size
+        batches = [
+            to_search[i:i + batch_size]
+            for i in range(0, len(to_search), batch_size)
+        ]
+        fresh: Dict[str, Dict] = {}
+        searched = await asyncio.gather(*(search(b) for b in batches))
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+        for batch, found in zip(batches, searched):
+            for name in batch:
+                rating = found.get(name) if found is not None else None
+                results[name] = rating
+                if rating:
+                    fresh[name] = rating
+                    self._memory_cache[miss_keys[name]] = rating
+                    await self._log_success(name, duration_ms)
+                elif found is not None:
+                    await self._log_not_found(name)
+        
+        # Write back everything found (DB hits and fresh lookups) in one go
+        to_cache = {
+            miss_keys[name]: results[name]
+            for name in to_fetch
+            if results.get(name)
+        }
+        if to_cache:
+            await cache_manager.set_many(to_cache, ttl=settings.cache_ttl_professor)
+        
+        await self._store_many_in_db(fresh)
         
         return results
@@ -2,16 +2,52 @@
 RateMyProfessors Scraper
 Fetches professor ratings from RateMyProfessors.com
 """
-import httpx
+import aiohttp
+import orjson
 from bs4 import BeautifulSoup
 from typing import Optional, Dict
 import logging
 import asyncio
 import json
 import base64
+from functools import lru_cache
+
+from config import settings
+from cache import cache_manager, rmp_cache_key, rmp_cache_pattern
+from utils.lru import LRUDict
 
 logger = logging.getLogger(__name__)
 
+# Known RMP school IDs, matched as substrings of the lowercased school
+# name; other schools are looked up with SchoolSearchQuery
+SCHOOL_IDS = {
+    "georgia state": "U2Nob29sLTM1MQ==",  # Base64 encoded school ID for GSU
+}
+
+TEACHER_FIELDS = """
+fragment TeacherFields on Teacher {
+    id
+    firstName
+    lastName
+    avgRating
+    avgDifficulty
+    wouldTakeAgainPercent
+    numRatings
+    department
+}
+"""
+
+
+@lru_cache(maxsize=None)
+def _batch_query(count: int) -> str:
+    """GraphQL document with `count` aliased teacher searches (t0, t1, ...)"""
+    params = ", ".join(f"$q{i}: TeacherSearchQuery!" for i in range(count))
+    fields = "\n".join(
+        f"    t{i}: newSearch {{ teachers(query: $q{i}, first: 5) {{ edges {{ node {{ ...TeacherFields }} }} }} }}"
+        for i in range(count)
+    )
+    return f"query BatchTeacherSearchQuery({params}) {{\n{fields}\n}}\n{TEACHER_FIELDS}"
+
 
 class RateMyProfessorsScraper:
     """Scraper for RateMyProfessors data"""
@@ -25,8 +61,28 @@ class RateMyProfessorsScraper:
             "Content-Type": "application/json"
         }
         
-        # Cache to avoid repeated lookups
-        self._cache = {}
+        # In-process cache in front of Redis (cache_manager) to skip the
+        # Redis round-trip for professors looked up repeatedly; bounded so
+        # a long-running process does not grow it forever
+        self._cache = LRUDict(maxsize=settings.rmp_memory_cache_size)
+        
+        # One pooled session for every request (created lazily)
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the shared HTTP session"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=15),
+                headers=self.headers
+            )
+        return self._session
+    
+    async def close(self):
+        """Close HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
     
     async def get_professor_rating(
         self,
@@ -43,14 +99,19 @@ class RateMyProfessorsScraper:
         Returns:
             Dict with rating data or None if not found
         """
-        # Check cache
-        cache_key = f"{professor_name}_{school}".lower()
+        # Check caches: process memory, then Redis
+        cache_key = rmp_cache_key(school, professor_name)
         if cache_key in self._cache:
             return self._cache[cache_key]
         
+        cached = await cache_manager.get(cache_key)
+        if cached is not None:
+            self._cache[cache_key] = cached
+            return cached
+        
         try:
             # First, get the school ID
-            school_id = await self._get_school_id(school)
+            school_id = self._school_id(school) or await self._search_school_id(school)
             if not school_id:
                 logger.warning(f"Could not find school ID for {school}")
                 return None
@@ -60,6 +121,7 @@ class RateMyProfessorsScraper:
             
             if professor_data:
                 self._cache[cache_key] = professor_data
+                await cache_manager.set(cache_key, professor_data, ttl=settings.cache_ttl_professor)
             
             return professor_data
             
@@ -67,14 +129,14 @@ class RateMyProfessorsScraper:
             logger.error(f"Error fetching rating for {professor_name}: {str(e)}")
             return None
     
-    async def _get_school_id(self, school_name: str) -> Optional[str]:
-        """Get the school ID from RateMyProfessors"""
-        
-        # GSU's known ID (you can hardcode this for performance)
-        if "georgia state" in school_name.lower():
-            return "U2Nob29sLTM1MQ=="  # Base64 encoded school ID for GSU
-        
-        # Otherwise search for it
+    @staticmethod
+    def _school_id(school_name: str) -> Optional[str]:
+        """School ID from SCHOOL_IDS without a request, or None if unknown"""
+        name = school_name.lower()
+        return next((school_id for known, school_id in SCHOOL_IDS.items() if known in name), None)
+    
+    async def _search_school_id(self, school_name: str) -> Optional[str]:
+        """Look up a school ID on RateMyProfessors (slow path for unknown schools)"""
         query = """
         query SchoolSearchQuery($query: String!) {
             search(query: $query) {
@@ -92,22 +154,15 @@ class RateMyProfessorsScraper:
         
         variables = {"query": school_name}
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            try:
-                response = await client.post(
-                    self.graphql_url,
-                    json={"query": query, "variables": variables},
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                schools = data.get("data", {}).get("search", {}).get("schools", {}).get("edges", [])
-                if schools:
-                    return schools[0]["node"]["id"]
-                
-            except Exception as e:
-                logger.error(f"Error getting school ID: {str(e)}")
+        try:
+            data = await self._post_graphql({"query": query, "variables": variables})
+            
+            schools = data.get("data", {}).get("search", {}).get("schools", {}).get("edges", [])
+            if schools:
+                return schools[0]["node"]["id"]
+            
+        except Exception as e:
+            logger.error(f"Error getting school ID: {str(e)}")
         
         return None
     
@@ -157,44 +212,140 @@ class RateMyProfessorsScraper:
             }
         }
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            try:
-                response = await client.post(
-                    self.graphql_url,
-                    json={"query": query, "variables": variables},
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                teachers = data.get("data", {}).get("search", {}).get("teachers", {}).get("edges", [])
-                
-                # Find best match
-                for teacher_edge in teachers:
-                    teacher = teacher_edge["node"]
-                    teacher_first = teacher["firstName"].lower()
-                    teacher_last = teacher["lastName"].lower()
-                    
-                    # Check if names match (allow for partial matches)
-                    if (teacher_last == last_name.lower() and 
-                        teacher_first.startswith(first_name[0].lower())):
-                        
-                        return {
-                            "rating": teacher.get("avgRating"),
-                            "difficulty": teacher.get("avgDifficulty"),
-                            "would_take_again": teacher.get("wouldTakeAgainPercent"),
-                            "num_ratings": teacher.get("numRatings"),
-                            "department": teacher.get("department"),
-                            "professor_id": teacher.get("id")
-                        }
-                
-                logger.info(f"No exact match found for {professor_name}")
-                return None
+        try:
+            data = await self._post_graphql({"query": query, "variables": variables})
+            
+            teachers = data.get("data", {}).get("search", {}).get("teachers", {}).get("edges", [])
+            
+            match = self._match_teacher(teachers, first_name, last_name)
+            if match:
+                return match
+            
+            logger.info(f"No exact match found for {professor_name}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error searching for professor: {str(e)}")
+            return None
+    
+    async def _post_graphql(self, payload: Dict) -> Dict:
+        """POST a GraphQL payload on the shared session; orjson both ways"""
+        session = await self._get_session()
+        async with session.post(self.graphql_url, data=orjson.dumps(payload)) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+    
+    def _match_teacher(self, teachers: list, first_name: str, last_name: str) -> Optional[Dict]:
+        """First search result whose last name matches and first name shares the initial"""
+        last_lower = last_name.lower()
+        first_initial = first_name[0].lower()
+        
+        for teacher_edge in teachers:
+            teacher = teacher_edge["node"]
+            
+            # Check if names match (allow for partial matches)
+            if (teacher["lastName"].lower() == last_lower and
+                teacher["firstName"][:1].lower() == first_initial):
                 
-            except Exception as e:
-                logger.error(f"Error searching for professor: {str(e)}")
-                return None
+                return {
+                    "rating": teacher.get("avgRating"),
+                    "difficulty": teacher.get("avgDifficulty"),
+                    "would_take_again": teacher.get("wouldTakeAgainPercent"),
+                    "num_ratings": teacher.get("numRatings"),
+                    "department": teacher.get("department"),
+                    "professor_id": teacher.get("id")
+                }
+        
+        return None
+    
+    async def batch_get_ratings(
+        self,
+        professor_names: list[str],
+        school: str = "Georgia State University"
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Get ratings for several professors, rmp_batch_size teacher searches
+        per GraphQL request (aliased newSearch fields), batches sent concurrently
+        
+        Returns:
+            Dict mapping each professor name to its rating data (None if not found)
+        """
+        results: Dict[str, Optional[Dict]] = {}
+        redis_keys = {}
+        for name in dict.fromkeys(professor_names):
+            cache_key = rmp_cache_key(school, name)
+            if cache_key in self._cache:
+                results[name] = self._cache[cache_key]
+            elif len(name.strip().split()) < 2:
+                logger.warning(f"Invalid professor name format: {name}")
+                results[name] = None
+            else:
+                redis_keys[name] = cache_key
+        
+        # Remaining names: one MGET against Redis
+        cached = await cache_manager.get_many(list(redis_keys.values()))
+        to_search = []
+        for name, cache_key in redis_keys.items():
+            if cache_key in cached:
+                results[name] = self._cache[cache_key] = cached[cache_key]
+            else:
+                to_search.append(name)
+        
+        if not to_search:
+            return results
+        
+        school_id = self._school_id(school) or await self._search_school_id(school)
+        if not school_id:
+            logger.warning(f"Could not find school ID for {school}")
+            results.update(dict.fromkeys(to_search))
+            return results
+        
+        batch_size = settings.rmp_batch_size
+        batches = [to_search[i:i + batch_size] for i in range(0, len(to_search), batch_size)]
+        found = await asyncio.gather(*(self._search_batch(batch, school_id) for batch in batches))
+        
+        fresh = {}
+        for batch, batch_found in zip(batches, found):
+            for name in batch:
+                professor_data = batch_found.get(name)
+                results[name] = professor_data
+                if professor_data:
+                    fresh[redis_keys[name]] = professor_data
+        
+        self._cache.update(fresh)
+        await cache_manager.set_many(fresh, ttl=settings.cache_ttl_professor)
+        
+        return results
+    
+    async def _search_batch(self, professor_names: list[str], school_id: str) -> Dict[str, Optional[Dict]]:
+        """One GraphQL request searching for every name in professor_names"""
+        variables = {
+            f"q{i}": {"text": name, "schoolID": school_id, "fallback": True}
+            for i, name in enumerate(professor_names)
+        }
+        
+        try:
+            data = await self._post_graphql({
+                "query": _batch_query(len(professor_names)),
+                "variables": variables
+            })
+        except Exception as e:
+            logger.error(f"Error batch searching for professors: {str(e)}")
+            return {}
+        
+        payload = data.get("data") or {}
+        results = {}
+        for i, name in enumerate(professor_names):
+            teachers = ((payload.get(f"t{i}") or {}).get("teachers") or {}).get("edges", [])
+            name_parts = name.strip().split()
+            results[name] = self._match_teacher(teachers, name_parts[0], name_parts[-1])
+        return results
     
     def clear_cache(self):
-        """Clear the rating cache"""
+        """Clear the in-process rating cache"""
+        self._cache.clear()
+    
+    async def clear_shared_cache(self) -> int:
+        """Clear the in-process cache and every RMP rating stored in Redis"""
         self._cache.clear()
+        return await cache_manager.clear_pattern(rmp_cache_pattern())
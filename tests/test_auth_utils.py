@@ -0,0 +1,94 @@
+"""
+Tests for the HS256 token helpers in auth_utils
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import HTTPException
+
+import auth_utils
+from auth_utils import create_access_token, sign_jwt, verify_jwt, verify_token
+
+
+def _expect_value_error(token: str):
+    try:
+        verify_jwt(token)
+    except ValueError:
+        return
+    raise AssertionError(f"verify_jwt accepted {token!r}")
+
+
+def _expect_http_401(token: str) -> str:
+    try:
+        verify_token(token)
+    except HTTPException as e:
+        assert e.status_code == 401
+        return e.detail
+    raise AssertionError(f"verify_token accepted {token!r}")
+
+
+def test_sign_and_verify_round_trip():
+    """A signed payload verifies back unchanged"""
+    payload = {"sub": "student@gsu.edu", "exp": 2_000_000_000, "roles": ["student"]}
+    token = sign_jwt(payload)
+    
+    assert token.count(".") == 2
+    assert verify_jwt(token) == payload
+
+
+def test_tampered_payload_rejected():
+    """Changing the body invalidates the signature"""
+    token = sign_jwt({"sub": "student@gsu.edu", "exp": 2_000_000_000})
+    header, _, signature = token.split(".")
+    forged_body = auth_utils._b64url_encode(b'{"sub":"admin@gsu.edu","exp":2000000000}').decode()
+    
+    _expect_value_error(f"{header}.{forged_body}.{signature}")
+
+
+def test_tampered_signature_rejected():
+    """A signature from another key is rejected"""
+    token = sign_jwt({"sub": "student@gsu.edu"})
+    signing_input, _ = token.rsplit(".", 1)
+    
+    _expect_value_error(signing_input + ".AAAA")
+    _expect_value_error(signing_input + ".")
+
+
+def test_malformed_tokens_rejected():
+    """Wrong segment counts, foreign headers and bad base64 are ValueErrors"""
+    token = sign_jwt({"sub": "student@gsu.edu"})
+    header, body, signature = token.split(".")
+    
+    _expect_value_error("")
+    _expect_value_error(f"{header}.{body}")
+    _expect_value_error(f"{token}.extra")
+    _expect_value_error(f"eyJhbGciOiJub25lIn0.{body}.{signature}")
+    _expect_value_error(f"{header}.!!!.{signature}")
+
+
+def test_access_token_expiry():
+    """create_access_token sets exp ahead; verify_token rejects expired tokens"""
+    token = create_access_token({"sub": "student@gsu.edu"})
+    payload = verify_token(token)
+    assert payload["sub"] == "student@gsu.edu"
+    assert payload["exp"] > time.time()
+    
+    expired = sign_jwt({"sub": "student@gsu.edu", "exp": int(time.time()) - 1})
+    assert _expect_http_401(expired) == "Token expired"
+
+
+def test_verify_token_requires_claims():
+    """Tokens without sub or an integer exp are invalid"""
+    assert _expect_http_401(sign_jwt({"exp": int(time.time()) + 60})) == "Invalid token"
+    assert _expect_http_401(sign_jwt({"sub": "x", "exp": "never"})) == "Invalid token"
+    assert _expect_http_401("not-a-token") == "Invalid token"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("All tests passed")
@@ -0,0 +1,85 @@
+"""
+Tests for utils.batcher.AsyncBatcher
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.batcher import AsyncBatcher
+
+
+class RecordingBatcher(AsyncBatcher):
+    """Keeps every batch it is handed"""
+    
+    def __init__(self, *args, fail_first: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+        self.fail_first = fail_first
+    
+    async def process_batch(self, batch):
+        if self.fail_first:
+            self.fail_first = False
+            raise RuntimeError("database down")
+        self.batches.append(list(batch))
+
+
+def test_flushes_at_max_batch_size():
+    """Items from concurrent callers are grouped up to max_batch_size"""
+    async def run():
+        batcher = RecordingBatcher(max_batch_size=3, max_queue_time=10)
+        await asyncio.gather(*(batcher.process(i) for i in range(7)))
+        await batcher.close()
+        return batcher.batches
+    
+    assert asyncio.run(run()) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_flushes_after_max_queue_time():
+    """A partial batch is written once max_queue_time has passed"""
+    async def run():
+        batcher = RecordingBatcher(max_batch_size=100, max_queue_time=0.05)
+        await batcher.process("a")
+        await batcher.process("b")
+        await asyncio.sleep(0.2)
+        flushed = list(batcher.batches)
+        await batcher.process("c")
+        await batcher.close()
+        return flushed, batcher.batches
+    
+    flushed, batches = asyncio.run(run())
+    assert flushed == [["a", "b"]]
+    assert batches == [["a", "b"], ["c"]]
+
+
+def test_close_flushes_pending_items():
+    """close() writes whatever is still queued"""
+    async def run():
+        batcher = RecordingBatcher(max_batch_size=100, max_queue_time=10)
+        for i in range(5):
+            await batcher.process(i)
+        await batcher.close()
+        await batcher.close()  # idempotent
+        return batcher.batches
+    
+    assert asyncio.run(run()) == [[0, 1, 2, 3, 4]]
+
+
+def test_failed_batch_does_not_stop_worker():
+    """A process_batch error is logged and later batches still go through"""
+    async def run():
+        batcher = RecordingBatcher(max_batch_size=2, max_queue_time=10, fail_first=True)
+        for i in range(4):
+            await batcher.process(i)
+        await batcher.close()
+        return batcher.batches
+    
+    assert asyncio.run(run()) == [[2, 3]]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("All tests passed")
@@ -0,0 +1,137 @@
+"""
+Tests for cache payload encoding and versioned keys
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import orjson
+
+from cache import (
+    CACHE_KEY_VERSION,
+    CacheManager,
+    _deserialize,
+    _serialize,
+    course_cache_key,
+    crn_cache_key,
+    professor_cache_key,
+    rmp_cache_key,
+)
+
+
+class FakeRedis:
+    """The handful of redis.asyncio calls CacheManager makes, kept in a dict"""
+    
+    def __init__(self):
+        self.data = {}
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+    
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+    
+    async def mset(self, items):
+        self.data.update(items)
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+    
+    def setex(self, key, ttl, value):
+        self.ops.append(lambda: self.redis.data.__setitem__(key, value))
+    
+    def getex(self, key, ex=None):
+        self.ops.append(lambda: self.redis.data.get(key))
+    
+    async def execute(self):
+        return [op() for op in self.ops]
+
+
+def _manager() -> CacheManager:
+    manager = CacheManager()
+    manager.redis_client = FakeRedis()
+    return manager
+
+
+def test_packed_round_trip():
+    """MessagePack payloads decode back to the same values"""
+    values = [
+        {"rating": 4.5, "tags": ["Caring"], "professor_id": "123", "none": None},
+        [{"crn": "12345", "days": ["M", "W"]}],
+        [],
+        "text",
+        0,
+        1,
+    ]
+    for value in values:
+        encoded = _serialize(value)
+        assert encoded[:1] == b"\x00"
+        assert _deserialize(encoded) == value
+
+
+def test_raw_round_trip():
+    """Raw payloads are stored and returned as the same bytes, undecoded"""
+    body = orjson.dumps([{"crn": "12345"}])
+    encoded = _serialize(body, raw=True)
+    
+    assert encoded == b"\x01" + body
+    assert _deserialize(encoded) == body
+    assert _deserialize(_serialize(b"", raw=True)) == b""
+
+
+def test_keys_are_versioned():
+    """Every key family carries CACHE_KEY_VERSION"""
+    keys = [
+        course_cache_key("202508", "CSC"),
+        crn_cache_key("202508", "12345"),
+        professor_cache_key("Jane Smith"),
+        rmp_cache_key("Georgia State University", "Jane Smith"),
+    ]
+    for key in keys:
+        assert key.startswith(f"{CACHE_KEY_VERSION}:")
+
+
+def test_professor_cache_key_slug():
+    """Professor keys are lowercased, underscored and stripped of punctuation"""
+    assert professor_cache_key("Dr. Jane  Smith, Jr.") == f"{CACHE_KEY_VERSION}:professor:dr_jane__smith_jr"
+
+
+def test_manager_round_trips():
+    """set/get and set_many/get_many agree on both payload kinds"""
+    async def run():
+        manager = _manager()
+        rating = {"rating": 4.0, "num_ratings": 12}
+        courses = orjson.dumps([{"crn": "1"}, {"crn": "2"}])
+        
+        await manager.set("a", rating, ttl=60)
+        await manager.set("b", courses, ttl=60, raw=True)
+        assert await manager.get("a") == rating
+        assert await manager.get("b") == courses
+        assert await manager.get("missing") is None
+        
+        await manager.set_many({"c": rating}, ttl=60)
+        await manager.set_many({"d": b"[]"}, raw=True)
+        assert await manager.get_many(["a", "b", "c", "d", "missing"]) == {
+            "a": rating, "b": courses, "c": rating, "d": b"[]",
+        }
+        assert await manager.get_many_and_refresh(["a", "missing"], ttl=60) == {"a": rating}
+    
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("All tests passed")
@@ -0,0 +1,197 @@
+"""
+Parity tests for utils.course_matcher.CourseMatcher against the original
+per-course matching loop
+"""
+import copy
+import math
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import CompletedCourse, CoursePreference, CoursePreferences, MatchedCourse, TimeSlot, Weekday
+from utils.course_matcher import CourseMatcher
+
+
+SUBJECTS = ["CSC", "MATH", "ENGL"]
+NUMBERS = ["1301", "1302", "2720", "3320"]
+PROFESSORS = [None, "Jane Smith", "Bob Jones", "Ann Lee"]
+DELIVERY = ["In-Person", "Online", "Hybrid"]
+DAY_CODES = ["M", "T", "W", "R", "F"]
+
+
+def _reference_match(preferences, available_courses, completed_courses=None):
+    """The scalar matcher as it was before vectorization, kept as the oracle"""
+    completed_set = {f"{c.subject}{c.course_number}" for c in completed_courses or []}
+    
+    def score_of(course, pref):
+        score = 50.0
+        if pref.course_number and course.course_number == pref.course_number:
+            score += 20
+        if preferences.prefer_online and course.delivery_method == "Online":
+            score += 10
+        elif not preferences.prefer_online and course.delivery_method == "In-Person":
+            score += 5
+        if pref.preferred_times and course.days and course.time:
+            if any(day in course.days.codes() for t in pref.preferred_times for day in t.days):
+                score += 15
+        if course.total_seats > 0:
+            score += course.seats_available / course.total_seats * 10
+        if course.professor_rating:
+            score += (course.professor_rating / 5.0) * 15
+        if course.would_take_again:
+            score += (course.would_take_again / 100.0) * 5
+        if course.professor_difficulty:
+            score -= (course.professor_difficulty / 5.0) * 3
+        return min(100.0, max(0.0, score))
+    
+    def conflicts(a, b):
+        if a.delivery_method == "Online" or b.delivery_method == "Online":
+            return False
+        if not a.days or not b.days:
+            return False
+        return bool(set(a.days.codes()) & set(b.days.codes()))
+    
+    matched = []
+    for pref in preferences.courses:
+        candidates = [
+            c for c in available_courses
+            if f"{c.subject}{c.course_number}" not in completed_set
+            and c.subject == pref.subject
+            and not (pref.course_number and c.course_number != pref.course_number)
+            and not (pref.online_only and c.delivery_method != "Online")
+            and not (c.professor and any(e.lower() in c.professor.lower() for e in pref.exclude_professors))
+            and c.seats_available > 0
+        ]
+        for course in candidates:
+            course.match_score = score_of(course, pref)
+            course.priority = pref.priority
+        candidates.sort(key=lambda x: x.match_score, reverse=True)
+        matched.extend(candidates[:3])
+    
+    seen, unique = set(), []
+    for course in matched:
+        if course.crn not in seen:
+            seen.add(course.crn)
+            unique.append(course)
+    
+    if preferences.avoid_time_conflicts:
+        result = []
+        for course in unique:
+            keep = True
+            for existing in result:
+                if conflicts(course, existing):
+                    if (course.priority < existing.priority or
+                            (course.priority == existing.priority and
+                             course.match_score > existing.match_score)):
+                        result.remove(existing)
+                    else:
+                        keep = False
+                    break
+            if keep:
+                result.append(course)
+        unique = result
+    
+    if preferences.max_credits:
+        result, total = [], 0
+        for course in unique:
+            if total + course.credits <= preferences.max_credits:
+                result.append(course)
+                total += course.credits
+        unique = result
+    
+    unique.sort(key=lambda x: (x.priority, -x.match_score))
+    return unique
+
+
+def _random_days(rng):
+    return Weekday.from_codes(rng.sample(DAY_CODES, rng.randint(0, 3)))
+
+
+def _random_course(rng, crn):
+    total = rng.choice([0, 20, 30, 45])
+    return MatchedCourse(
+        crn=str(crn),
+        subject=rng.choice(SUBJECTS),
+        course_number=rng.choice(NUMBERS),
+        section=f"{rng.randint(1, 9):02d}",
+        title="Course",
+        credits=rng.choice([1, 3, 4]),
+        professor=rng.choice(PROFESSORS),
+        days=_random_days(rng),
+        time=rng.choice([None, "9:30 am - 10:45 am"]),
+        seats_available=rng.randint(-1, total) if total else rng.randint(-1, 5),
+        total_seats=total,
+        delivery_method=rng.choice(DELIVERY),
+        professor_rating=rng.choice([None, 0.0, round(rng.uniform(1, 5), 1)]),
+        professor_difficulty=rng.choice([None, round(rng.uniform(1, 5), 1)]),
+        would_take_again=rng.choice([None, round(rng.uniform(0, 100), 1)]),
+    )
+
+
+def _random_preferences(rng):
+    courses = [
+        CoursePreference(
+            subject=rng.choice(SUBJECTS),
+            course_number=rng.choice([None] + NUMBERS),
+            priority=rng.randint(1, 3),
+            online_only=rng.random() < 0.2,
+            exclude_professors=rng.sample(["smith", "JONES", "lee"], rng.randint(0, 1)),
+            preferred_times=[
+                TimeSlot(days=rng.sample(DAY_CODES, rng.randint(1, 2)), start_time="09:00", end_time="10:15")
+            ] if rng.random() < 0.5 else [],
+        )
+        for _ in range(rng.randint(1, 4))
+    ]
+    return CoursePreferences(
+        courses=courses,
+        subjects=SUBJECTS,
+        max_credits=rng.choice([None, 6, 12]),
+        avoid_time_conflicts=rng.random() < 0.7,
+        prefer_online=rng.random() < 0.5,
+    )
+
+
+def _summary(courses):
+    return [(c.crn, c.priority, c.match_score) for c in courses]
+
+
+def _assert_same(actual, expected):
+    assert [crn for crn, _, _ in actual] == [crn for crn, _, _ in expected]
+    for (_, priority, score), (_, want_priority, want_score) in zip(actual, expected):
+        assert priority == want_priority
+        assert math.isclose(score, want_score, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_random_parity_with_reference():
+    """Vectorized matching agrees with the scalar loop over random catalogs"""
+    rng = random.Random(1301)
+    matcher = CourseMatcher()
+    
+    for _ in range(300):
+        catalog = [_random_course(rng, 10000 + i) for i in range(rng.randint(0, 25))]
+        completed = [
+            CompletedCourse(subject=rng.choice(SUBJECTS), course_number=rng.choice(NUMBERS), grade="A", term="202408")
+            for _ in range(rng.randint(0, 2))
+        ]
+        preferences = _random_preferences(rng)
+        
+        expected = _reference_match(preferences, copy.deepcopy(catalog), completed)
+        actual = matcher.match_courses(preferences, copy.deepcopy(catalog), completed)
+        
+        _assert_same(_summary(actual), _summary(expected))
+
+
+def test_empty_catalog():
+    """No courses means no matches"""
+    preferences = CoursePreferences(courses=[CoursePreference(subject="CSC")], subjects=["CSC"])
+    
+    assert CourseMatcher().match_courses(preferences, []) == []
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("All tests passed")
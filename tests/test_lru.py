@@ -0,0 +1,67 @@
+"""
+Tests for utils.lru.LRUDict
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.lru import LRUDict
+
+
+def test_evicts_least_recently_written():
+    """Past maxsize the oldest entry goes first"""
+    cache = LRUDict(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["c"] = 3
+    
+    assert list(cache) == ["b", "c"]
+
+
+def test_read_marks_recently_used():
+    """Reading an entry protects it from the next eviction"""
+    cache = LRUDict(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+    
+    assert "a" in cache
+    assert "b" not in cache
+
+
+def test_overwrite_does_not_grow():
+    """Rewriting a key refreshes it without evicting anything"""
+    cache = LRUDict(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"] = 10
+    
+    assert dict(cache) == {"b": 2, "a": 10}
+    cache["c"] = 3
+    assert dict(cache) == {"a": 10, "c": 3}
+
+
+def test_missing_key_raises():
+    """Misses behave like a dict: KeyError, and membership checks don't reorder"""
+    cache = LRUDict(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert "a" in cache
+    cache["c"] = 3
+    
+    assert "a" not in cache
+    try:
+        cache["a"]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("expected KeyError")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("All tests passed")
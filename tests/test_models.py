@@ -0,0 +1,59 @@
+"""
+Tests for the MatchedCourse day flags (Weekday)
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from models import MatchedCourse, Weekday
+
+
+def _course(**fields) -> MatchedCourse:
+    base = {
+        "crn": "12345", "subject": "CSC", "course_number": "1301",
+        "section": "01", "title": "Intro", "credits": 3,
+    }
+    return MatchedCourse(**{**base, **fields})
+
+
+def test_weekday_from_codes():
+    """Day codes fold into flags; unknown codes are ignored"""
+    assert Weekday.from_codes("MWF") == Weekday.M | Weekday.W | Weekday.F
+    assert Weekday.from_codes(["T", "R"]) == Weekday.T | Weekday.R
+    assert Weekday.from_codes("MXZ") == Weekday.M
+    assert Weekday.from_codes("") == Weekday(0)
+
+
+def test_weekday_codes_in_week_order():
+    """codes() lists days Monday first regardless of input order"""
+    assert Weekday.from_codes("FWM").codes() == ["M", "W", "F"]
+    assert Weekday(0).codes() == []
+
+
+def test_days_validator_accepts_all_input_forms():
+    """Lists, strings, ints and Weekday values all validate to the same flags"""
+    expected = Weekday.M | Weekday.W
+    for days in (["M", "W"], ("W", "M"), "MW", 5, expected):
+        assert _course(days=days).days == expected
+
+
+def test_days_validator_tba_is_no_days():
+    """Banner's TBA placeholder and empty strings mean no meeting days, not Tuesday"""
+    for days in ("TBA", "tba", " TBA ", "", []):
+        assert _course(days=days).days == Weekday(0)
+
+
+def test_days_serialized_as_codes():
+    """model_dump and JSON emit the day-code list, which validates back"""
+    course = _course(days="TR")
+    assert course.model_dump()["days"] == ["T", "R"]
+    assert '"days":["T","R"]' in course.model_dump_json()
+    assert MatchedCourse(**course.model_dump()).days == course.days
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("All tests passed")
@@ -0,0 +1,163 @@
+"""
+Tests for Banner page parsing and request coalescing in scrapers.paws_scraper
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+import scrapers.paws_scraper as paws_scraper
+from models import Weekday
+from scrapers.paws_scraper import PAWSScraper, _CourseTableStream
+
+FIXTURE = Path(__file__).parent / "fixtures" / "banner_schedule.html"
+
+
+def _parse(chunks, open_only=False):
+    """Feed the page through a fresh stream and parse every table pair"""
+    scraper = PAWSScraper()
+    stream = _CourseTableStream(encoding="utf-8")
+    courses = []
+    for chunk in chunks:
+        courses += scraper._parse_table_pairs(stream.feed(chunk), "CSC", "202408", open_only)
+    courses += scraper._parse_table_pairs(stream.close(), "CSC", "202408", open_only)
+    return courses
+
+
+def _chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_pairs_captioned_tables():
+    """Each captioned table pairs with the next course table; stray tables are skipped"""
+    stream = _CourseTableStream(encoding="utf-8")
+    pairs = list(stream.feed(FIXTURE.read_bytes())) + list(stream.close())
+    
+    assert len(pairs) == 3
+    assert all(header.tag == "table" and detail.tag == "table" for header, detail in pairs)
+
+
+def test_parses_saved_page():
+    """Courses come out of the saved results page with their meeting details"""
+    courses = {c.crn: c for c in _parse([FIXTURE.read_bytes()])}
+    
+    assert list(courses) == ["12345", "22222", "33333"]
+    
+    intro = courses["12345"]
+    assert (intro.subject, intro.course_number, intro.section) == ("CSC", "1301", "01")
+    assert intro.title == "Intro to Computer Science"
+    assert intro.professor == "Jane Smith"
+    assert intro.days == Weekday.T | Weekday.R
+    assert intro.time == "9:30 am - 10:45 am"
+    assert (intro.seats_available, intro.total_seats, intro.credits) == (5, 30, 3)
+    
+    # TBA meeting rows are passed over for the first scheduled one
+    lab = courses["22222"]
+    assert lab.days == Weekday.M | Weekday.W
+    assert lab.location == "Langdale Hall 402"
+    assert lab.professor == "Bob Jones"
+    assert (lab.seats_available, lab.credits) == (0, 4)
+    
+    web = courses["33333"]
+    assert web.delivery_method == "Online"
+    assert web.days == Weekday(0)
+    assert web.time is None
+    assert (web.seats_available, web.total_seats) == (12, 40)
+
+
+def test_chunked_feed_matches_whole_page():
+    """Splitting the page at arbitrary byte offsets does not change the result"""
+    data = FIXTURE.read_bytes()
+    whole = [c.model_dump() for c in _parse([data])]
+    
+    for size in (1, 7, 64, 1000):
+        assert [c.model_dump() for c in _parse(_chunked(data, size))] == whole
+
+
+def test_open_only_skips_full_sections():
+    """open_only drops sections without seats"""
+    courses = _parse([FIXTURE.read_bytes()], open_only=True)
+    
+    assert [c.crn for c in courses] == ["12345", "33333"]
+
+
+
+class DisabledResponseCache:
+    """Stand-in for http_response_cache that never hits"""
+    enabled = False
+    
+    def make_key(self, *args):
+        return "key"
+    
+    async def get(self, key):
+        return None
+    
+    async def set(self, key, value, ttl):
+        pass
+
+
+def _run_with_banner(status, scenario):
+    """Run scenario(scraper, requests) against a mock Banner answering searches with status"""
+    requests = {"term": 0, "search": 0}
+    page = FIXTURE.read_bytes()
+    
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        if "proc_term" in str(request.url):
+            requests["term"] += 1
+            return httpx.Response(200, text="ok")
+        requests["search"] += 1
+        return httpx.Response(status, content=page, headers={"content-type": "text/html"})
+    
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            scraper = PAWSScraper(session=client)
+            result = await scenario(scraper)
+            assert scraper._inflight == {}
+            return result
+    
+    saved = paws_scraper.http_response_cache
+    paws_scraper.http_response_cache = DisabledResponseCache()
+    try:
+        return asyncio.run(main()), requests
+    finally:
+        paws_scraper.http_response_cache = saved
+
+
+def test_concurrent_scrapes_share_one_request():
+    """Callers asking for the same page at once wait on a single search"""
+    async def scenario(scraper):
+        return await asyncio.gather(
+            *(scraper._scrape_subject_once("202408", "CSC") for _ in range(5)),
+            scraper._scrape_subject_once("202408", "MATH"),
+        )
+    
+    results, requests = _run_with_banner(200, scenario)
+    
+    assert requests == {"term": 1, "search": 2}
+    assert all(len(courses) == 3 for courses in results)
+    assert all(courses is results[0] for courses in results[:5])
+
+
+def test_shared_scrape_error_reaches_every_caller():
+    """A failed shared search is raised to each waiting caller"""
+    async def scenario(scraper):
+        return await asyncio.gather(
+            *(scraper._scrape_subject_once("202408", "CSC") for _ in range(3)),
+            return_exceptions=True,
+        )
+    
+    results, requests = _run_with_banner(500, scenario)
+    
+    assert requests["search"] == 1
+    assert all(isinstance(error, httpx.HTTPStatusError) for error in results)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("All tests passed")
@@ -0,0 +1,55 @@
+"""
+Tests for utils.rate_limiter.AsyncRateLimiter
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.rate_limiter import AsyncRateLimiter
+
+
+async def _acquire_times(limiter: AsyncRateLimiter, count: int) -> list:
+    """Loop times at which each of `count` concurrent acquires succeeded"""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    times = []
+    
+    async def take():
+        async with limiter:
+            times.append(loop.time() - start)
+    
+    await asyncio.gather(*(take() for _ in range(count)))
+    return sorted(times)
+
+
+def test_burst_then_paced():
+    """The first `rate` acquires pass at once; later ones wait one period/rate each"""
+    times = asyncio.run(_acquire_times(AsyncRateLimiter(rate=5, period=0.5), 8))
+    
+    assert all(t < 0.05 for t in times[:5])
+    # 3 more tokens at 0.1s each
+    assert 0.25 <= times[-1] < 0.5
+
+
+def test_fractional_rate_allows_one_at_a_time():
+    """A rate below 1 still lets a single request through immediately"""
+    times = asyncio.run(_acquire_times(AsyncRateLimiter(rate=0.5, period=0.1), 2))
+    
+    assert times[0] < 0.05
+    assert 0.15 <= times[1] < 0.4
+
+
+def test_zero_rate_disables_limiting():
+    """rate <= 0 never waits"""
+    times = asyncio.run(_acquire_times(AsyncRateLimiter(rate=0), 50))
+    
+    assert times[-1] < 0.05
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+    print("All tests passed")
@@ -0,0 +1,76 @@
+"""
+Async Batcher
+Coalesces items submitted by many coroutines into batched writes
+"""
+from typing import Any, List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AsyncBatcher:
+    """
+    Collects items from concurrent callers and hands them to process_batch
+    in groups
+    
+    A batch is flushed once max_batch_size items are queued or
+    max_queue_time seconds after its first item arrived, whichever comes
+    first. Subclasses implement process_batch.
+    """
+    
+    def __init__(self, max_batch_size: int = 100, max_queue_time: float = 1.0):
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def process(self, item: Any):
+        """Queue an item; returns immediately, the write happens in the next batch"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        self._queue.put_nowait(item)
+    
+    async def process_batch(self, batch: List[Any]):
+        """Handle one batch of items"""
+        raise NotImplementedError
+    
+    async def close(self):
+        """Flush queued items and stop the worker"""
+        if self._worker is None or self._worker.done():
+            return
+        self._queue.put_nowait(_STOP)
+        await self._worker
+    
+    async def _run(self):
+        """Worker loop: gather items into batches and flush them"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            
+            batch = [item]
+            deadline = loop.time() + self.max_queue_time
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            try:
+                await self.process_batch(batch)
+            except Exception as e:
+                logger.error(f"Error processing batch of {len(batch)}: {e}")
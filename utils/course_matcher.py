@@ -6,11 +6,38 @@ from typing import List, Optional, Set
 from datetime import datetime, time
 import logging
 
-from models import CoursePreferences, MatchedCourse, CompletedCourse
+import numpy as np
+
+from models import CoursePreferences, MatchedCourse, CompletedCourse, Weekday
 
 logger = logging.getLogger(__name__)
 
 
+class _CourseTable:
+    """Column-oriented view of the course catalog for vectorized matching"""
+    
+    def __init__(self, courses: List[MatchedCourse], completed_set: Set[str]):
+        n = len(courses)
+        
+        self.subject = np.array([c.subject for c in courses], dtype=object)
+        self.course_number = np.array([c.course_number for c in courses], dtype=object)
+        self.completed = np.array(
+            [f"{c.subject}{c.course_number}" in completed_set for c in courses], dtype=bool
+        )
+        self.online = np.array([c.delivery_method == "Online" for c in courses], dtype=bool)
+        self.in_person = np.array([c.delivery_method == "In-Person" for c in courses], dtype=bool)
+        self.has_professor = np.array([bool(c.professor) for c in courses], dtype=bool)
+        self.professor = np.array([(c.professor or "").lower() for c in courses], dtype=str)
+        self.has_time = np.array([bool(c.days and c.time) for c in courses], dtype=bool)
+        self.days = np.fromiter((c.days for c in courses), dtype=np.int64, count=n)
+        self.seats_available = np.fromiter((c.seats_available for c in courses), dtype=np.float64, count=n)
+        self.total_seats = np.fromiter((c.total_seats for c in courses), dtype=np.float64, count=n)
+        self.open_seats = self.seats_available > 0
+        self.rating = np.fromiter((c.professor_rating or 0.0 for c in courses), dtype=np.float64, count=n)
+        self.difficulty = np.fromiter((c.professor_difficulty or 0.0 for c in courses), dtype=np.float64, count=n)
+        self.would_take_again = np.fromiter((c.would_take_again or 0.0 for c in courses), dtype=np.float64, count=n)
+
+
 class CourseMatcher:
     """Matches courses based on student preferences"""
     
@@ -39,28 +66,27 @@ class CourseMatcher:
                 for c in completed_courses
             }
         
+        table = _CourseTable(available_courses, completed_set)
         matched = []
         
         for pref in preferences.courses:
             # Find courses matching this preference
-            candidates = self._find_matching_courses(
-                pref,
-                available_courses,
-                completed_set,
-                preferences
-            )
+            candidates = self._find_matching_courses(pref, table)
+            if candidates.size == 0:
+                continue
             
             # Score and rank candidates
-            for course in candidates:
-                score = self._calculate_match_score(course, pref, preferences)
+            scores = self._calculate_match_scores(candidates, pref, preferences, table)
+            for i, score in zip(candidates.tolist(), scores.tolist()):
+                course = available_courses[i]
                 course.match_score = score
                 course.priority = pref.priority
             
-            # Sort by score and take best matches
-            candidates.sort(key=lambda x: x.match_score, reverse=True)
+            # Sort by score (stable, so ties keep catalog order) and take best matches
+            best = np.argsort(-scores, kind="stable")[:3]
             
             # Add top matches (limit to avoid overwhelming)
-            matched.extend(candidates[:3])
+            matched.extend(available_courses[i] for i in candidates[best].tolist())
         
         # Remove duplicates
         seen_crns = set()
@@ -84,113 +110,73 @@ class CourseMatcher:
         logger.info(f"Matched {len(unique_matched)} courses after filtering")
         return unique_matched
     
-    def _find_matching_courses(
-        self,
-        preference,
-        available_courses: List[MatchedCourse],
-        completed_set: Set[str],
-        preferences: CoursePreferences
-    ) -> List[MatchedCourse]:
-        """Find courses matching a specific preference"""
-        matches = []
+    def _find_matching_courses(self, preference, table: "_CourseTable") -> np.ndarray:
+        """Return indices of courses matching a specific preference"""
+        mask = table.open_seats & ~table.completed
+        mask &= table.subject == preference.subject
         
-        for course in available_courses:
-            course_code = f"{course.subject}{course.course_number}"
-            
-            # Skip if already completed
-            if course_code in completed_set:
-                continue
-            
-            # Check subject match
-            if course.subject != preference.subject:
-                continue
-            
-            # Check course number if specified
-            if preference.course_number and course.course_number != preference.course_number:
-                continue
-            
-            # Check online preference
-            if preference.online_only and course.delivery_method != "Online":
-                continue
-            
-            # Check excluded professors
-            if course.professor and any(
-                excl.lower() in course.professor.lower() 
-                for excl in preference.exclude_professors
-            ):
-                continue
-            
-            # Check seats available
-            if course.seats_available <= 0:
-                continue
-            
-            matches.append(course)
+        # Check course number if specified
+        if preference.course_number:
+            mask &= table.course_number == preference.course_number
+        
+        # Check online preference
+        if preference.online_only:
+            mask &= table.online
+        
+        # Check excluded professors
+        for excl in preference.exclude_professors:
+            mask &= ~(table.has_professor & (np.char.find(table.professor, excl.lower()) >= 0))
         
-        return matches
+        return np.flatnonzero(mask)
     
-    def _calculate_match_score(
+    def _calculate_match_scores(
         self,
-        course: MatchedCourse,
+        candidates: np.ndarray,
         preference,
-        preferences: CoursePreferences
-    ) -> float:
+        preferences: CoursePreferences,
+        table: "_CourseTable"
+    ) -> np.ndarray:
         """
-        Calculate how well a course matches preferences
+        Calculate how well each candidate course matches preferences
         
         Returns:
-            Score from 0-100
+            Array of scores from 0-100, aligned with candidates
         """
-        score = 50.0  # Base score
+        score = np.full(candidates.size, 50.0)  # Base score
         
-        # Exact course number match
-        if preference.course_number and course.course_number == preference.course_number:
+        # Exact course number match (guaranteed by the filter when specified)
+        if preference.course_number:
             score += 20
         
         # Online preference bonus
-        if preferences.prefer_online and course.delivery_method == "Online":
-            score += 10
-        elif not preferences.prefer_online and course.delivery_method == "In-Person":
-            score += 5
-        
-        # Time preference matching
-        if preference.preferred_times and course.days and course.time:
-            time_match = self._check_time_match(course, preference.preferred_times)
-            if time_match:
-                score += 15
+        if preferences.prefer_online:
+            score += np.where(table.online[candidates], 10.0, 0.0)
+        else:
+            score += np.where(table.in_person[candidates], 5.0, 0.0)
+        
+        # Time preference matching (simple day overlap for now)
+        if preference.preferred_times:
+            wanted = int(Weekday.from_codes(
+                day for pref_time in preference.preferred_times for day in pref_time.days
+            ))
+            time_match = table.has_time[candidates] & ((table.days[candidates] & wanted) != 0)
+            score += np.where(time_match, 15.0, 0.0)
         
         # Seats availability bonus (prefer courses with more seats)
-        if course.total_seats > 0:
-            availability_ratio = course.seats_available / course.total_seats
-            score += availability_ratio * 10
+        total = table.total_seats[candidates]
+        seats = table.seats_available[candidates]
+        score += np.divide(seats, total, out=np.zeros_like(score), where=total > 0) * 10
         
-        # Professor rating bonus
-        if course.professor_rating:
-            # Rating is 0-5, normalize to 0-15
-            score += (course.professor_rating / 5.0) * 15
+        # Professor rating bonus (0-5 normalized to 0-15; missing data is 0)
+        score += (table.rating[candidates] / 5.0) * 15
         
         # Would take again bonus
-        if course.would_take_again:
-            score += (course.would_take_again / 100.0) * 5
+        score += (table.would_take_again[candidates] / 100.0) * 5
         
         # Difficulty penalty (prefer easier courses slightly)
-        if course.professor_difficulty:
-            # Difficulty is 0-5, penalize harder courses slightly
-            score -= (course.professor_difficulty / 5.0) * 3
-        
-        return min(100.0, max(0.0, score))
-    
-    def _check_time_match(self, course: MatchedCourse, preferred_times) -> bool:
-        """Check if course time matches preferred times"""
-        # Simple day matching for now
-        if not course.days:
-            return False
-        
-        for pref_time in preferred_times:
-            # Check if days overlap
-            if any(day in course.days for day in pref_time.days):
-                return True
+        score -= (table.difficulty[candidates] / 5.0) * 3
         
-        return False
+        return np.clip(score, 0.0, 100.0)
     
     def _resolve_conflicts(self, courses: List[MatchedCourse]) -> List[MatchedCourse]:
         """
@@ -228,11 +214,7 @@ class CourseMatcher:
             return False
         
         # Check if they share any days
-        if not course1.days or not course2.days:
-            return False
-        
-        shared_days = set(course1.days) & set(course2.days)
-        if not shared_days:
+        if not course1.days & course2.days:
             return False
         
         # If they share days and have time info, would need to parse times
@@ -4,32 +4,54 @@ Parses student evaluation and preference files
 """
 import json
 import pandas as pd
-from typing import List, Optional, Dict, Any
+try:
+    import polars as pl
+except ImportError:  # pandas remains the fallback CSV reader
+    pl = None
+from typing import List, Optional, Dict, Any, BinaryIO, Iterable, Tuple, Union
 import logging
 from io import BytesIO
 
+from pydantic import TypeAdapter
+
 from models import CoursePreferences, CoursePreference, CompletedCourse, TimeSlot
 
 logger = logging.getLogger(__name__)
 
+# Validators built once at import and reused for every row
+_PREFERENCES_ADAPTER = TypeAdapter(CoursePreferences)
+_PREFERENCE_ADAPTER = TypeAdapter(CoursePreference)
+_COMPLETED_ADAPTER = TypeAdapter(CompletedCourse)
+
+# Parsers accept an open binary file (e.g. UploadFile.file) or raw bytes
+FileInput = Union[BinaryIO, bytes]
+
+
+def _as_file(content: FileInput) -> BinaryIO:
+    """Wrap raw bytes so every parser can read from a file object"""
+    if isinstance(content, (bytes, bytearray)):
+        return BytesIO(content)
+    return content
+
 
 class FileParser:
     """Parses uploaded student files"""
     
-    def parse_evaluation(self, content: bytes, filename: str) -> List[CompletedCourse]:
+    def parse_evaluation(self, content: FileInput, filename: str) -> List[CompletedCourse]:
         """
         Parse student evaluation/transcript file
         
         Supported formats: CSV, Excel, JSON, TXT
         
         Args:
-            content: File content as bytes
+            content: Binary file object (read incrementally) or raw bytes
             filename: Original filename
             
         Returns:
             List of CompletedCourse objects
         """
         try:
+            content = _as_file(content)
             file_ext = filename.lower().split('.')[-1]
             
             if file_ext in ['xlsx', 'xls']:
@@ -48,20 +70,21 @@ class FileParser:
             logger.error(f"Error parsing evaluation file: {str(e)}")
             return []
     
-    def parse_preferences(self, content: bytes, filename: str) -> CoursePreferences:
+    def parse_preferences(self, content: FileInput, filename: str) -> CoursePreferences:
         """
         Parse course preferences file
         
         Supported formats: JSON, CSV, Excel
         
         Args:
-            content: File content as bytes
+            content: Binary file object (read incrementally) or raw bytes
             filename: Original filename
             
         Returns:
             CoursePreferences object
         """
         try:
+            content = _as_file(content)
             file_ext = filename.lower().split('.')[-1]
             
             if file_ext in ['xlsx', 'xls']:
@@ -78,28 +101,36 @@ class FileParser:
             logger.error(f"Error parsing preferences file: {str(e)}")
             return self._default_preferences()
     
-    def _parse_excel_evaluation(self, content: bytes) -> List[CompletedCourse]:
+    def _parse_excel_evaluation(self, content: BinaryIO) -> List[CompletedCourse]:
         """Parse Excel evaluation file"""
-        df = pd.read_excel(BytesIO(content))
+        df = pd.read_excel(content)
+        return self._evaluation_from_rows(list(df.columns), df.to_dict('records'))
+    
+    def _evaluation_from_rows(
+        self,
+        columns: List[str],
+        rows: Iterable[Dict[str, Any]]
+    ) -> List[CompletedCourse]:
+        """Build completed courses from tabular rows (one dict per row)"""
         courses = []
         
         # Expected columns: Subject, Course Number, Grade, Term
         # Try common column name variations
-        col_map = self._map_columns(df.columns, {
+        col_map = self._map_columns(columns, {
             'subject': ['subject', 'subj', 'dept', 'department'],
             'course_number': ['course number', 'course', 'number', 'course_num'],
             'grade': ['grade', 'final grade', 'letter grade'],
             'term': ['term', 'semester', 'period']
         })
         
-        for _, row in df.iterrows():
+        for row in rows:
             try:
-                course = CompletedCourse(
-                    subject=str(row[col_map['subject']]).strip().upper(),
-                    course_number=str(row[col_map['course_number']]).strip(),
-                    grade=str(row[col_map['grade']]).strip().upper(),
-                    term=str(row[col_map['term']]).strip()
-                )
+                course = _COMPLETED_ADAPTER.validate_python({
+                    'subject': str(row[col_map['subject']]).strip().upper(),
+                    'course_number': str(row[col_map['course_number']]).strip(),
+                    'grade': str(row[col_map['grade']]).strip().upper(),
+                    'term': str(row[col_map['term']]).strip()
+                })
                 courses.append(course)
             except Exception as e:
                 logger.warning(f"Error parsing row: {e}")
@@ -107,21 +138,20 @@ class FileParser:
         
         return courses
     
-    def _parse_csv_evaluation(self, content: bytes) -> List[CompletedCourse]:
+    def _parse_csv_evaluation(self, content: BinaryIO) -> List[CompletedCourse]:
         """Parse CSV evaluation file"""
-        df = pd.read_csv(BytesIO(content))
-        return self._parse_excel_evaluation(content)  # Reuse Excel parser
+        return self._evaluation_from_rows(*self._read_csv_rows(content))
     
-    def _parse_json_evaluation(self, content: bytes) -> List[CompletedCourse]:
+    def _parse_json_evaluation(self, content: BinaryIO) -> List[CompletedCourse]:
         """Parse JSON evaluation file"""
-        data = json.loads(content.decode('utf-8'))
+        data = json.load(content)
         courses = []
         
         # Expect array of course objects
         if isinstance(data, list):
             for item in data:
                 try:
-                    course = CompletedCourse(**item)
+                    course = _COMPLETED_ADAPTER.validate_python(item)
                     courses.append(course)
                 except Exception as e:
                     logger.warning(f"Error parsing course: {e}")
@@ -129,45 +159,52 @@ class FileParser:
         
         return courses
     
-    def _parse_text_evaluation(self, content: bytes) -> List[CompletedCourse]:
+    def _parse_text_evaluation(self, content: BinaryIO) -> List[CompletedCourse]:
         """Parse plain text evaluation file"""
         # Simple parser for text transcripts
         # Expected format: "SUBJECT COURSE_NUM GRADE TERM" per line
-        text = content.decode('utf-8')
         courses = []
         
-        for line in text.split('\n'):
-            parts = line.strip().split()
+        # Read line by line instead of decoding the whole file at once
+        for raw_line in content:
+            parts = raw_line.decode('utf-8').strip().split()
             if len(parts) >= 4:
                 try:
-                    course = CompletedCourse(
-                        subject=parts[0].upper(),
-                        course_number=parts[1],
-                        grade=parts[2].upper(),
-                        term=parts[3]
-                    )
+                    course = _COMPLETED_ADAPTER.validate_python({
+                        'subject': parts[0].upper(),
+                        'course_number': parts[1],
+                        'grade': parts[2].upper(),
+                        'term': parts[3]
+                    })
                     courses.append(course)
                 except Exception:
                     continue
         
         return courses
     
-    def _parse_excel_preferences(self, content: bytes) -> CoursePreferences:
+    def _parse_excel_preferences(self, content: BinaryIO) -> CoursePreferences:
         """Parse Excel preferences file"""
-        df = pd.read_excel(BytesIO(content))
-        
+        df = pd.read_excel(content)
+        return self._preferences_from_rows(list(df.columns), df.to_dict('records'))
+    
+    def _preferences_from_rows(
+        self,
+        columns: List[str],
+        rows: Iterable[Dict[str, Any]]
+    ) -> CoursePreferences:
+        """Build preferences from tabular rows (one dict per row)"""
         courses = []
         subjects = set()
         
         # Expected columns: Subject, Course Number (optional), Priority, Online Only, etc.
-        col_map = self._map_columns(df.columns, {
+        col_map = self._map_columns(columns, {
             'subject': ['subject', 'subj', 'dept'],
             'course_number': ['course number', 'course', 'number'],
             'priority': ['priority', 'pref', 'preference'],
             'online_only': ['online only', 'online', 'online_only']
         })
         
-        for _, row in df.iterrows():
+        for row in rows:
             try:
                 subject = str(row[col_map['subject']]).strip().upper()
                 subjects.add(subject)
@@ -184,12 +221,12 @@ class FileParser:
                 if 'online_only' in col_map and pd.notna(row.get(col_map['online_only'])):
                     online_only = bool(row[col_map['online_only']])
                 
-                pref = CoursePreference(
-                    subject=subject,
-                    course_number=course_num,
-                    priority=priority,
-                    online_only=online_only
-                )
+                pref = _PREFERENCE_ADAPTER.validate_python({
+                    'subject': subject,
+                    'course_number': course_num,
+                    'priority': priority,
+                    'online_only': online_only
+                })
                 courses.append(pref)
             except Exception as e:
                 logger.warning(f"Error parsing preference row: {e}")
@@ -200,29 +237,24 @@ class FileParser:
             subjects=list(subjects)
         )
     
-    def _parse_csv_preferences(self, content: bytes) -> CoursePreferences:
+    def _parse_csv_preferences(self, content: BinaryIO) -> CoursePreferences:
         """Parse CSV preferences file"""
-        df = pd.read_csv(BytesIO(content))
-        # Convert to bytes for Excel parser reuse
-        buffer = BytesIO()
-        df.to_excel(buffer, index=False)
-        buffer.seek(0)
-        return self._parse_excel_preferences(buffer.getvalue())
+        return self._preferences_from_rows(*self._read_csv_rows(content))
     
-    def _parse_json_preferences(self, content: bytes) -> CoursePreferences:
+    def _parse_json_preferences(self, content: BinaryIO) -> CoursePreferences:
         """Parse JSON preferences file"""
-        data = json.loads(content.decode('utf-8'))
+        data = json.load(content)
         
         # Support direct CoursePreferences format or array of courses
         if isinstance(data, dict) and 'courses' in data:
-            return CoursePreferences(**data)
+            return _PREFERENCES_ADAPTER.validate_python(data)
         elif isinstance(data, list):
             # Array of course preferences
             courses = []
             subjects = set()
             for item in data:
                 try:
-                    pref = CoursePreference(**item)
+                    pref = _PREFERENCE_ADAPTER.validate_python(item)
                     courses.append(pref)
                     subjects.add(pref.subject)
                 except Exception as e:
@@ -236,6 +268,21 @@ class FileParser:
         
         return self._default_preferences()
     
+    def _read_csv_rows(self, content: BinaryIO) -> Tuple[List[str], Iterable[Dict[str, Any]]]:
+        """
+        Read a CSV into (columns, rows)
+        
+        Uses Polars' native CSV reader when installed, pandas otherwise.
+        Missing cells come back as None (Polars) or NaN (pandas); both
+        are handled by pd.notna in the row builders.
+        """
+        if pl is not None:
+            df = pl.read_csv(content, infer_schema_length=1000)
+            return df.columns, df.iter_rows(named=True)
+        
+        df = pd.read_csv(content)
+        return list(df.columns), df.to_dict('records')
+    
     def _map_columns(self, columns: List[str], mapping: Dict[str, List[str]]) -> Dict[str, str]:
         """Map actual column names to expected names"""
         result = {}
@@ -0,0 +1,27 @@
+"""
+LRU Dict
+Size-bounded mapping for in-process caches
+"""
+from collections import OrderedDict
+
+
+class LRUDict(OrderedDict):
+    """
+    Dict holding at most maxsize entries; reads and writes mark an entry
+    as recently used and the least recently used entry is evicted first
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
@@ -0,0 +1,48 @@
+"""
+Async Rate Limiter
+Token bucket that spaces out outbound requests independently of concurrency
+"""
+import asyncio
+
+
+class AsyncRateLimiter:
+    """
+    Allows up to `rate` acquisitions per `period` seconds, with bursts of at
+    most max(rate, 1); callers over the limit wait for the next token
+    
+    A rate of 0 or less disables limiting.
+    """
+    
+    def __init__(self, rate: float, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self.capacity = max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated: float = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if self.rate <= 0:
+            return
+        
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                now = loop.time()
+                if self._updated:
+                    refill = (now - self._updated) * self.rate / self.period
+                    self._tokens = min(self.capacity, self._tokens + refill)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False